@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+drop_duplicates a escala: huellas de 64 bits, filtro de Bloom y corridas ordenadas en disco
+@author: Alex Ballera
+"""
+#%%
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Clave del segundo hash (hash_pandas_object pide 16 caracteres): con dos
+# huellas independientes una coincidencia falsa entre bloques es ~1/2¹²⁸
+CLAVE_VERIFICACION = 'deduplicacion-02'
+
+#%% ===========================================================================
+# Huellas y deduplicación en memoria
+# =============================================================================
+def huellas(df, subset=None, hash_key=None):
+    """Una huella uint64 por fila, vectorizada (no crea tuplas ni objetos por fila).
+
+    El hash depende del tipo: 75 (int64) y 75.0 (float64) dan huellas
+    distintas, así que los bloques de un mismo archivo deben tener los
+    mismos tipos (ver `normalizar` en pandas_pipeline_streaming).
+    """
+    datos = df if subset is None else df[subset]
+    opciones = {} if hash_key is None else {'hash_key': hash_key}
+    return pd.util.hash_pandas_object(datos, index=False, **opciones).to_numpy()
+
+
+def duplicados(df, subset=None, h=None):
+    """Igual que `df.duplicated(subset)` (keep='first') comparando filas solo si chocan sus huellas.
+
+    Una fila cuya huella es única no puede estar repetida; las que
+    comparten huella (repetidas de verdad o colisiones) se comparan
+    completas con `duplicated`, así el resultado es exacto y solo esas
+    filas se materializan. `h` permite pasar las huellas ya calculadas.
+    """
+    h = huellas(df, subset) if h is None else h
+    candidatas = pd.Series(h).duplicated(keep=False).to_numpy()
+    mascara = np.zeros(len(df), dtype=bool)
+    if candidatas.any():
+        posiciones = np.flatnonzero(candidatas)
+        parte = df.iloc[posiciones] if subset is None else df.iloc[posiciones][subset]
+        mascara[posiciones] = parte.duplicated().to_numpy()
+    return mascara
+
+
+def quitar_duplicados(df, subset=None):
+    """`df.drop_duplicates(subset)` usando `duplicados`."""
+    return df[~duplicados(df, subset)]
+
+#%% ===========================================================================
+# Filtro de Bloom
+# =============================================================================
+class FiltroBloom:
+    """Conjunto aproximado en un array de bits: dice "seguro que no" o "quizás sí".
+
+    Para `capacidad` elementos y una tasa de falsos positivos `tasa` usa
+    m = -n·ln(p)/ln(2)² bits y k = m/n·ln(2) posiciones por elemento
+    (~1,2 bytes por elemento con p = 1%). Las k posiciones salen de dos
+    huellas con doble hashing: h1 + i·h2 (mod m).
+    """
+    def __init__(self, capacidad, tasa=0.01):
+        capacidad = max(int(capacidad), 1)
+        self.m = max(int(-capacidad * np.log(tasa) / np.log(2) ** 2), 64)
+        self.k = max(int(round(self.m / capacidad * np.log(2))), 1)
+        self.bits = np.zeros((self.m + 7) // 8, dtype=np.uint8)
+
+    def _posiciones(self, h1, h2):
+        i = np.arange(self.k, dtype=np.uint64)
+        return (h1[:, None] + i * (h2[:, None] | np.uint64(1))) % np.uint64(self.m)
+
+    def agregar(self, h1, h2):
+        posiciones = self._posiciones(h1, h2).ravel()
+        np.bitwise_or.at(self.bits, posiciones >> np.uint64(3),
+                         np.left_shift(1, posiciones & np.uint64(7)).astype(np.uint8))
+
+    def contiene(self, h1, h2):
+        posiciones = self._posiciones(h1, h2)
+        marcados = self.bits[posiciones >> np.uint64(3)] >> (posiciones & np.uint64(7)).astype(np.uint8)
+        return (marcados & 1).all(axis=1)
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+#%% ===========================================================================
+# Huellas ordenadas (en memoria o en disco)
+# =============================================================================
+def _insertar(h1_ordenadas, h2_ordenadas, h1, h2):
+    """Agrega pares manteniendo el orden por h1: O(n + k) con np.insert, sin reordenar todo."""
+    orden = np.argsort(h1)
+    h1, h2 = h1[orden], h2[orden]
+    posiciones = np.searchsorted(h1_ordenadas, h1)
+    return np.insert(h1_ordenadas, posiciones, h1), np.insert(h2_ordenadas, posiciones, h2)
+
+
+def _contenidas(h1_ordenadas, h2_ordenadas, h1, h2):
+    """Qué pares (h1, h2) están entre los ordenados por h1: búsqueda binaria y se confirma h2."""
+    izquierda = np.searchsorted(h1_ordenadas, h1, side='left')
+    derecha = np.searchsorted(h1_ordenadas, h1, side='right')
+    encontradas = np.zeros(h1.size, dtype=bool)
+    unica = derecha - izquierda == 1
+    encontradas[unica] = np.asarray(h2_ordenadas[izquierda[unica]]) == h2[unica]
+    for i in np.flatnonzero(derecha - izquierda > 1):   # mismo h1 en varias filas: muy raro
+        encontradas[i] = bool((np.asarray(h2_ordenadas[izquierda[i]:derecha[i]]) == h2[i]).any())
+    return encontradas
+
+#%% ===========================================================================
+# Deduplicación en streaming con presupuesto de memoria
+# =============================================================================
+class DeduplicadorStreaming:
+    """`drop_duplicates()` sobre bloques con memoria acotada; se usa igual que `DeduplicadorHash`.
+
+    Por cada fila distinta se guardan dos huellas de 64 bits (16 bytes):
+    - dentro de un bloque las repetidas se detectan con `duplicados`
+      (exacto: las filas que chocan se comparan completas);
+    - contra bloques anteriores, una fila es repetida si coinciden ambas
+      huellas.
+    Las huellas viven en un array ordenado en memoria hasta llenar
+    `presupuesto_bytes`; entonces se escriben a disco como una corrida
+    ordenada (.npy) que después se consulta con `np.load(mmap_mode='r')` y
+    búsqueda binaria, sin cargarla. El filtro de Bloom (`esperadas` filas
+    distintas) evita ir a disco por las filas que seguro son nuevas: con
+    p = 1% solo ~1 de cada 100 filas nuevas consulta las corridas. Cada
+    corrida suma una búsqueda binaria por fila dudosa: conviene un
+    presupuesto que deje pocas corridas.
+
+    >>> with DeduplicadorStreaming(presupuesto_bytes=256 << 20, esperadas=10**8) as dedup:
+    ...     procesar_csv('datos.csv', deduplicador=dedup)
+    """
+    def __init__(self, presupuesto_bytes=64 << 20, esperadas=None, tasa_bloom=0.01,
+                 directorio=None, subset=None):
+        self.subset = subset
+        self.bloom = FiltroBloom(esperadas, tasa_bloom) if esperadas else None
+        memoria = presupuesto_bytes - (self.bloom.nbytes if self.bloom else 0)
+        if memoria < 16 * 1024:
+            raise ValueError(f'presupuesto_bytes={presupuesto_bytes:,} no alcanza: hacen falta al menos '
+                             f'16 KiB además del filtro de Bloom')
+        self.capacidad = memoria // 32   # 16 bytes por fila y espacio para fusionar
+        self._directorio = directorio
+        self._temporal = None
+        self._h1 = np.empty(0, dtype=np.uint64)
+        self._h2 = np.empty(0, dtype=np.uint64)
+        self.corridas = []   # pares (h1, h2) de memmaps ordenados
+        self._n = 0
+
+    def _carpeta(self):
+        if self._temporal is None:
+            self._temporal = Path(tempfile.mkdtemp(prefix='dedup-', dir=self._directorio))
+        return self._temporal
+
+    def _volcar(self):
+        """Escribe las huellas en memoria como una corrida ordenada y libera la memoria."""
+        carpeta = self._carpeta()
+        base = carpeta / f'corrida_{len(self.corridas):05d}'
+        np.save(f'{base}_h1.npy', self._h1)
+        np.save(f'{base}_h2.npy', self._h2)
+        self.corridas.append((np.load(f'{base}_h1.npy', mmap_mode='r'),
+                              np.load(f'{base}_h2.npy', mmap_mode='r')))
+        self._h1 = np.empty(0, dtype=np.uint64)
+        self._h2 = np.empty(0, dtype=np.uint64)
+
+    def _vistas(self, h1, h2):
+        vistas = _contenidas(self._h1, self._h2, h1, h2)
+        if self.corridas:
+            dudosas = ~vistas
+            if self.bloom is not None:
+                dudosas &= self.bloom.contiene(h1, h2)
+            posiciones = np.flatnonzero(dudosas)
+            for h1_corrida, h2_corrida in self.corridas:
+                if posiciones.size == 0:
+                    break
+                halladas = _contenidas(h1_corrida, h2_corrida, h1[posiciones], h2[posiciones])
+                vistas[posiciones[halladas]] = True
+                posiciones = posiciones[~halladas]
+        return vistas
+
+    def nuevas(self, bloque):
+        """Máscara con las filas del bloque que no aparecieron antes (la primera de cada una)."""
+        h1 = huellas(bloque, self.subset)
+        mascara = ~duplicados(bloque, self.subset, h1)
+        posiciones = np.flatnonzero(mascara)
+        h1 = h1[posiciones]
+        h2 = huellas(bloque.iloc[posiciones], self.subset, CLAVE_VERIFICACION)
+        vistas = self._vistas(h1, h2)
+        mascara[posiciones[vistas]] = False
+
+        nuevas = ~vistas
+        if self.bloom is not None:
+            self.bloom.agregar(h1[nuevas], h2[nuevas])
+        self._h1, self._h2 = _insertar(self._h1, self._h2, h1[nuevas], h2[nuevas])
+        self._n += int(nuevas.sum())
+        if self._h1.size >= self.capacidad:
+            self._volcar()
+        return mascara
+
+    def __len__(self):
+        return self._n
+
+    def cerrar(self):
+        """Borra las corridas del disco."""
+        self.corridas.clear()
+        if self._temporal is not None:
+            shutil.rmtree(self._temporal, ignore_errors=True)
+            self._temporal = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def __repr__(self):
+        bloom = f', bloom={self.bloom.nbytes:,} B' if self.bloom else ''
+        return (f'DeduplicadorStreaming({self._n:,} filas distintas, {self._h1.size:,} en memoria, '
+                f'{len(self.corridas)} corridas en disco{bloom})')
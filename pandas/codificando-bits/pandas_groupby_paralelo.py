@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+groupby en varios procesos: parciales (cantidad, suma, min, max, M2) por rango de filas y fusión al final
+@author: Alex Ballera
+"""
+#%%
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+#%% ===========================================================================
+# Parciales por grupo
+# =============================================================================
+@dataclass
+class Parciales:
+    """Estadísticos combinables de cada grupo y columna (arrays de grupos × columnas).
+
+    Con (cantidad, suma, mínimo, máximo, M2) se obtienen media, varianza y
+    desvío de la unión de dos rangos de filas sin volver a leerlas. Los
+    cuantiles no entran: la mediana de dos mitades no se deduce de las
+    medianas de cada una.
+    """
+    cantidad: np.ndarray
+    suma: np.ndarray
+    minimo: np.ndarray
+    maximo: np.ndarray
+    m2: np.ndarray
+
+    @property
+    def media(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.suma / self.cantidad
+
+    def combinar(self, otro):
+        """Fusión de Chan et al.: M2 = M2a + M2b + δ²·na·nb/n, con δ la diferencia de medias."""
+        n = self.cantidad + otro.cantidad
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = np.where(otro.cantidad > 0, otro.media, 0) - np.where(self.cantidad > 0, self.media, 0)
+            extra = np.where(n > 0, delta ** 2 * self.cantidad * otro.cantidad / n, 0)
+        return Parciales(n, self.suma + otro.suma, np.fmin(self.minimo, otro.minimo),
+                         np.fmax(self.maximo, otro.maximo), self.m2 + otro.m2 + extra)
+
+
+def calcular_parciales(codigos, valores, n_grupos):
+    """Parciales de un rango de filas: `codigos` (n,) con -1 para clave NaN, `valores` (n, k)."""
+    k = valores.shape[1]
+    validos = codigos >= 0
+    codigos, valores = codigos[validos], valores[validos]
+    cantidad = np.empty((n_grupos, k))
+    suma = np.empty((n_grupos, k))
+    m2 = np.empty((n_grupos, k))
+    minimo = np.full((n_grupos, k), np.inf)
+    maximo = np.full((n_grupos, k), -np.inf)
+    for j in range(k):
+        columna = valores[:, j]
+        hay = ~np.isnan(columna)
+        c, x = codigos[hay], columna[hay]
+        cantidad[:, j] = np.bincount(c, minlength=n_grupos)
+        suma[:, j] = np.bincount(c, weights=x, minlength=n_grupos)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            media = suma[:, j] / cantidad[:, j]
+        m2[:, j] = np.bincount(c, weights=(x - media[c]) ** 2, minlength=n_grupos)
+        np.minimum.at(minimo[:, j], c, x)   # sin ordenar: una pasada, sin buffers
+        np.maximum.at(maximo[:, j], c, x)
+    vacios = cantidad == 0
+    minimo[vacios] = np.nan
+    maximo[vacios] = np.nan
+    return Parciales(cantidad, suma, minimo, maximo, m2)
+
+#%% ===========================================================================
+# Trabajo de cada proceso: lee su rango desde memoria compartida
+# =============================================================================
+def _parciales_de_rango(nombre_codigos, nombre_valores, n_filas, n_columnas, n_grupos, inicio, fin):
+    # Los procesos del pool comparten el rastreador de recursos del principal,
+    # que es quien crea los bloques y los borra (unlink) al terminar
+    memoria_codigos = SharedMemory(name=nombre_codigos)
+    memoria_valores = SharedMemory(name=nombre_valores)
+    codigos = valores = None
+    try:
+        codigos = np.ndarray((n_filas,), dtype=np.int64, buffer=memoria_codigos.buf)
+        valores = np.ndarray((n_filas, n_columnas), dtype=np.float64, buffer=memoria_valores.buf)
+        return calcular_parciales(codigos[inicio:fin], valores[inicio:fin], n_grupos)
+    finally:
+        del codigos, valores   # soltar las vistas antes de cerrar los bloques
+        memoria_codigos.close()
+        memoria_valores.close()
+
+
+def _a_memoria_compartida(array):
+    memoria = SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=memoria.buf)[...] = array
+    return memoria
+
+#%% ===========================================================================
+# Agrupado paralelo
+# =============================================================================
+def _factorizar(df, por):
+    """Códigos por fila (-1 si la clave tiene NaN) y grupos ordenados, como los de `df.groupby(por)`.
+
+    Una columna se factoriza directo; con varias, `ngroup` numera las
+    combinaciones y los grupos quedan en un MultiIndex.
+    """
+    if isinstance(por, list):
+        if not por:
+            raise ValueError('`por` necesita al menos una columna')
+        if len(por) > 1:
+            agrupado = df.groupby(por, sort=True)
+            codigos = agrupado.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+            return codigos, agrupado.size().index
+        por = por[0]
+    elif not pd.api.types.is_hashable(por):
+        raise TypeError(f'`por` debe ser una columna o una lista de columnas, no {type(por).__name__}')
+    codigos, grupos = pd.factorize(df[por], sort=True)
+    return codigos.astype(np.int64), pd.Index(grupos, name=por)
+
+
+class AgrupadoParalelo:
+    """`df.groupby(por)[columnas]` repartido por rangos de filas entre procesos.
+
+    Las claves se factorizan una vez (`pd.factorize`, ordenadas como en
+    groupby) y los códigos y valores se copian a memoria compartida: cada
+    proceso recibe solo nombres y límites, no un DataFrame serializado.
+    Cada uno devuelve parciales de tamaño grupos × columnas y se fusionan
+    en el proceso principal.
+
+    >>> agrupado = AgrupadoParalelo(df_csv, 'estado', 'IMC')   # o ['estado', 'sobrepeso']
+    >>> agrupado.mean().sort_values(ascending=False)
+    >>> agrupado.agg(['mean', 'min', 'max'])
+
+    Con menos de `min_filas` filas (o `procesos=1`) se calcula en el mismo
+    proceso: arrancar procesos cuesta más que agrupar unas miles de filas.
+    Las medias pueden diferir de las de pandas en el último decimal, porque
+    pandas suma con compensación de Kahan y aquí se suman parciales.
+    """
+    FUNCIONES = ('count', 'sum', 'mean', 'std', 'var', 'min', 'max')
+
+    def __init__(self, df, por, columnas, procesos=None, min_filas=1_000_000):
+        self._serie = isinstance(columnas, str)
+        self.columnas = [columnas] if self._serie else list(columnas)
+        codigos, self.grupos = _factorizar(df, por)
+        valores = df[self.columnas].to_numpy(dtype=np.float64, na_value=np.nan)
+        procesos = procesos or os.cpu_count() or 1
+
+        if procesos == 1 or len(df) < min_filas:
+            self.parciales = calcular_parciales(codigos, valores, len(self.grupos))
+        else:
+            self.parciales = self._en_paralelo(codigos, valores, len(self.grupos), procesos)
+
+    @staticmethod
+    def _en_paralelo(codigos, valores, n_grupos, procesos):
+        n_filas, n_columnas = valores.shape
+        limites = np.linspace(0, n_filas, procesos + 1).astype(int)
+        memoria_codigos = _a_memoria_compartida(codigos)
+        memoria_valores = _a_memoria_compartida(valores)
+        try:
+            with ProcessPoolExecutor(procesos) as ejecutor:
+                tareas = [ejecutor.submit(_parciales_de_rango, memoria_codigos.name, memoria_valores.name,
+                                          n_filas, n_columnas, n_grupos, inicio, fin)
+                          for inicio, fin in zip(limites[:-1], limites[1:])]
+                resultados = [tarea.result() for tarea in tareas]
+        finally:
+            for memoria in (memoria_codigos, memoria_valores):
+                memoria.close()
+                memoria.unlink()
+        total = resultados[0]
+        for parcial in resultados[1:]:
+            total = total.combinar(parcial)
+        return total
+
+    def _salida(self, datos):
+        tabla = pd.DataFrame(datos, index=self.grupos, columns=self.columnas)
+        return tabla[self.columnas[0]] if self._serie else tabla
+
+    # --------------------------------------------------------- agregaciones
+    def count(self):
+        return self._salida(self.parciales.cantidad.astype(np.int64))
+
+    def sum(self):
+        return self._salida(self.parciales.suma)
+
+    def mean(self):
+        return self._salida(self.parciales.media)
+
+    def var(self, ddof=1):
+        p = self.parciales
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._salida(np.where(p.cantidad > ddof, p.m2 / (p.cantidad - ddof), np.nan))
+
+    def std(self, ddof=1):
+        return np.sqrt(self.var(ddof))
+
+    def min(self):
+        return self._salida(self.parciales.minimo)
+
+    def max(self):
+        return self._salida(self.parciales.maximo)
+
+    def agg(self, funciones):
+        """Como `groupby(...).agg(['mean', 'min', 'max'])` con las funciones de FUNCIONES."""
+        if isinstance(funciones, str):
+            return getattr(self, funciones)()
+        desconocidas = set(funciones) - set(self.FUNCIONES)
+        if desconocidas:
+            raise ValueError(f'Funciones no combinables: {sorted(desconocidas)}; se admiten {self.FUNCIONES}')
+        resultados = {f: getattr(self, f)() for f in funciones}
+        if self._serie:
+            return pd.DataFrame(resultados)
+        tabla = pd.concat(resultados, axis=1).swaplevel(axis=1)
+        return tabla[pd.MultiIndex.from_product([self.columnas, list(funciones)])]
+
+    def describe(self):
+        """Como `groupby(...).describe()` pero sin cuantiles (no se pueden combinar por partes)."""
+        return self.agg(['count', 'mean', 'std', 'min', 'max']).astype(np.float64)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sesión de lectura: se parsea el archivo una vez y usecols/skipfooter/nrows/sheet_name son proyecciones
+@author: Alex Ballera
+"""
+#%%
+import io
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+#%% ===========================================================================
+# Inferencia de tipos sobre una porción de columna
+# =============================================================================
+def _enteras_con_nan(tabla):
+    """Columnas float que solo lo son por tener NaN: el resto de sus valores son enteros."""
+    enteras = []
+    for nombre in tabla.columns:
+        valores = tabla[nombre].to_numpy()
+        if valores.dtype.kind == 'f':
+            nan = np.isnan(valores)
+            if nan.any() and (valores[~nan] == np.trunc(valores[~nan])).all():
+                enteras.append(nombre)
+    return enteras
+
+
+# Opciones de read_csv que cambian cómo se interpreta el texto de una celda
+_OPCIONES_VALOR = ('true_values', 'false_values', 'na_values', 'keep_default_na', 'na_filter',
+                   'decimal', 'thousands', 'date_format', 'dayfirst')
+
+
+def _opciones_columna(opciones, nombre):
+    """Las opciones de lectura que afectan a la columna `nombre`, para releerla sola."""
+    propias = {clave: opciones[clave] for clave in _OPCIONES_VALOR if clave in opciones}
+    for clave in ('dtype', 'converters'):
+        valor = opciones.get(clave)
+        if isinstance(valor, dict):
+            if nombre in valor:
+                propias[clave] = {nombre: valor[nombre]}
+        elif valor is not None:
+            propias[clave] = valor
+    fechas = opciones.get('parse_dates')
+    if fechas is True or (isinstance(fechas, list) and nombre in fechas):
+        propias['parse_dates'] = [nombre]
+    return propias
+
+
+def _reinferir(columna, entera, opciones=None):
+    """Tipo que le daría el lector a esta porción de una columna ya parseada.
+
+    Quitar filas solo puede cambiar el tipo de dos clases de columnas:
+    - texto: con el pie de página una columna de números, booleanos o
+      fechas queda como texto. En CSV cada celda conserva el texto del
+      archivo y la porción se vuelve a parsear con `read_csv` (con las
+      `opciones` de la sesión), así la inferencia es la del lector. En
+      Excel las celdas ya son números, booleanos o fechas de Python y
+      alcanza con `infer_objects`.
+    - float por culpa de celdas vacías (`entera`): si en la porción no
+      quedan NaN, el lector la habría leído como int64.
+    El resto (columnas que ya tienen un tipo no textual) no cambia.
+    """
+    if pd.api.types.is_float_dtype(columna.dtype):
+        if entera and len(columna) and not columna.isna().any():
+            return columna.astype(np.int64)
+        return columna
+    if columna.dtype == object or pd.api.types.is_string_dtype(columna.dtype):
+        if opciones is None:
+            return columna.infer_objects() if columna.dtype == object else columna
+        texto = columna.to_csv(index=False, header=False)
+        releida = pd.read_csv(io.StringIO(texto), header=None, names=[columna.name], skip_blank_lines=False,
+                              **_opciones_columna(opciones, columna.name))
+        return releida[columna.name].set_axis(columna.index)
+    return columna
+
+
+def _posiciones_excel(usecols):
+    """'A:C,E' -> [0, 1, 2, 4]: letras de columna de Excel como las entiende `pd.read_excel`."""
+    def posicion(letras):
+        letras = letras.strip().upper()
+        if not letras.isascii() or not letras.isalpha():
+            raise ValueError(f'usecols={usecols!r}: {letras!r} no es una columna de Excel (A, B, ..., AA, ...)')
+        numero = 0
+        for letra in letras:
+            numero = numero * 26 + ord(letra) - ord('A') + 1
+        return numero - 1
+
+    posiciones = []
+    for parte in usecols.split(','):
+        extremos = [posicion(letras) for letras in parte.split(':')]
+        if len(extremos) > 2:
+            raise ValueError(f'usecols={usecols!r}: rango inválido {parte!r}')
+        posiciones.extend(range(extremos[0], extremos[-1] + 1))
+    return posiciones
+
+#%% ===========================================================================
+# Sesión
+# =============================================================================
+class SesionLectura:
+    """Lee un CSV o Excel una sola vez y responde variantes de lectura sin volver al disco.
+
+    El archivo se lee y parsea al crear la sesión (en Excel, todas las hojas) y
+    cada `leer(...)` elige columnas (`usecols`) y filas (`nrows`,
+    `skipfooter`) de ese resultado. Si se quitaron filas, se vuelve a
+    inferir el tipo solo de las columnas que pueden cambiar (ver
+    `_reinferir`), y esas porciones se guardan para reutilizarlas.
+
+    >>> sesion = SesionLectura('dataset_pandas.csv')
+    >>> df_csv = sesion.leer()                                  # pd.read_csv(ruta)
+    >>> df_csv = sesion.leer(usecols=['edad', 'email', 'estado'])
+    >>> df_csv = sesion.leer(skipfooter=1)
+    >>> SesionLectura('dataset_pandas.xlsx').leer(usecols='A:C,E')   # letras, solo en Excel
+
+    Con Copy-on-Write (pandas 3) los DataFrames devueltos pueden compartir
+    columnas entre sí sin que modificar uno afecte a los otros.
+    """
+    def __init__(self, ruta, **opciones):
+        self.ruta = Path(ruta)
+        self.es_csv = self.ruta.suffix.lower() in ('.csv', '.txt')
+        if self.es_csv:
+            contenido = self.ruta.read_bytes()
+            tabla = pd.read_csv(io.BytesIO(contenido), **opciones)
+            self._hojas = {0: tabla}
+            self.hojas = [0]
+            # '1' y '1.0' dan el mismo float: se mira el texto (ya en memoria)
+            # de las columnas dudosas para saber si eran enteros
+            dudosas = _enteras_con_nan(tabla)
+            if dudosas:
+                texto = pd.read_csv(io.BytesIO(contenido), **{**opciones, 'usecols': dudosas, 'dtype': str})
+                dudosas = [c for c in dudosas if texto[c].dropna().str.fullmatch(r'\s*[+-]?\d+\s*').all()]
+            self._enteras = {0: set(dudosas)}
+            self._opciones = opciones
+        else:
+            # read_excel ya convierte las celdas float con valor entero a int
+            self._hojas = pd.read_excel(self.ruta, sheet_name=None, **opciones)
+            self.hojas = list(self._hojas)
+            self._enteras = {h: set(_enteras_con_nan(t)) for h, t in self._hojas.items()}
+            self._opciones = None
+        self._porciones = {}
+
+    def _hoja(self, sheet_name):
+        if isinstance(sheet_name, int):
+            sheet_name = self.hojas[sheet_name]
+        if sheet_name not in self._hojas:
+            raise ValueError(f'Worksheet named {sheet_name!r} not found')
+        return sheet_name, self._hojas[sheet_name]
+
+    def _columnas(self, tabla, usecols):
+        """Nombres pedidos, en el orden del archivo (como hacen los lectores de pandas)."""
+        if usecols is None:
+            return list(tabla.columns)
+        if callable(usecols):
+            return [c for c in tabla.columns if usecols(c)]
+        if isinstance(usecols, str):
+            if self.es_csv:
+                raise ValueError(f'usecols={usecols!r}: en CSV se pasa una lista de nombres o posiciones '
+                                 f'(los rangos de letras como "A:C" son solo de Excel)')
+            usecols = _posiciones_excel(usecols)
+        pedidas = set(usecols)
+        if all(isinstance(c, (int, np.integer)) for c in pedidas):
+            return [c for i, c in enumerate(tabla.columns) if i in pedidas]
+        faltan = [c for c in usecols if c not in tabla.columns]
+        if faltan:
+            raise ValueError(f'Usecols do not match columns, columns expected but not found: {faltan}')
+        return [c for c in tabla.columns if c in pedidas]
+
+    def leer(self, usecols=None, skipfooter=0, nrows=None, sheet_name=0):
+        """Como `pd.read_csv`/`pd.read_excel` con esas opciones, pero sin releer el archivo.
+
+        `sheet_name` se ignora en CSV. `skipfooter` descuenta filas del final
+        del resultado y `nrows` limita desde el principio.
+        """
+        hoja, tabla = self._hoja(0 if self.es_csv else sheet_name)
+        fin = len(tabla) - skipfooter
+        if nrows is not None:
+            fin = min(fin, nrows)
+        fin = max(fin, 0)
+
+        columnas = self._columnas(tabla, usecols)
+        if fin == len(tabla):
+            return tabla[columnas]
+        if fin == 0:
+            return tabla[columnas].iloc[:0].astype(object)   # sin filas no hay tipos que inferir
+        datos = {}
+        for nombre in columnas:
+            clave = (hoja, nombre, fin)
+            if clave not in self._porciones:
+                entera = nombre in self._enteras[hoja]
+                self._porciones[clave] = _reinferir(tabla[nombre].iloc[:fin], entera, self._opciones)
+            datos[nombre] = self._porciones[clave]
+        return pd.DataFrame(datos)
+
+    def olvidar(self):
+        """Libera las porciones guardadas (el parseo completo se conserva)."""
+        self._porciones.clear()
+
+    def __repr__(self):
+        filas = {h: len(c) for h, c in self._hojas.items()}
+        return f'SesionLectura({str(self.ruta)!r}, filas={filas})'
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tutorial pandas desde cero (tutorial-pandas-desde-cero.ipynb) pensado para archivos grandes
+@author: Alex Ballera
+"""
+#%%
+import os
+
+import pandas as pd
+
+from pandas_deduplicacion import DeduplicadorStreaming, quitar_duplicados
+from pandas_groupby_paralelo import AgrupadoParalelo
+from pandas_pipeline_streaming import procesar_csv, procesar_en_memoria
+from pandas_sesion_lectura import SesionLectura
+
+if __name__ == '__main__':   # los procesos hijos de AgrupadoParalelo vuelven a importar este archivo
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+#%% ======================================================================
+# Lectura: el archivo se parsea una vez y cada variante es una proyección
+    csv = SesionLectura('dataset_pandas.csv')
+    df_csv = csv.leer()                                     # todas las columnas
+    df_csv_cols = csv.leer(usecols=['edad', 'email', 'estado'])
+    df_csv_sin_pie = csv.leer(skipfooter=1)                 # sin el footer
+    print(csv)
+    print(df_csv_sin_pie.equals(pd.read_csv('dataset_pandas.csv', skipfooter=1, engine='python')))
+#%%
+    xls = SesionLectura('dataset_pandas.xlsx')
+    df_xls = xls.leer()                                     # primera hoja
+    df_mini = xls.leer(sheet_name='mini_tabla')
+    df_xls_cols = xls.leer(usecols=['id', 'edad', 'IMC'])
+    df_xls_sin_pie = xls.leer(skipfooter=3)                 # sin las tres últimas filas
+    print(xls)
+    print(df_xls_sin_pie.equals(pd.read_excel('dataset_pandas.xlsx', skipfooter=3)))
+#%% ======================================================================
+# Limpieza y agregación por bloques: memoria constante para CSV de cualquier tamaño
+    # drop_duplicates -> dropna -> sobrepeso -> IMC medio por estado -> datos_IMC.csv
+    df_imc = procesar_csv('dataset_pandas.csv', 'datos_IMC.csv', tamano_bloque=100, pie=1)
+    print(df_imc)
+#%%
+    print(df_imc.equals(procesar_en_memoria('dataset_pandas.csv', pie=1)))
+#%% ======================================================================
+# groupby en varios procesos: parciales por rango de filas que se fusionan
+    df_limpio = df_csv_sin_pie.drop_duplicates().dropna()
+    agrupado = AgrupadoParalelo(df_limpio, 'estado', 'IMC', procesos=2, min_filas=0)
+    print(agrupado.mean().sort_values(ascending=False).head())
+    print(agrupado.agg(['mean', 'min', 'max']).head())
+    print(agrupado.describe().head())   # count, mean, std, min, max (sin cuantiles)
+#%% ======================================================================
+# drop_duplicates con huellas de 64 bits: exacto y sin comparar filas completas
+    print(quitar_duplicados(df_csv_sin_pie).equals(df_csv_sin_pie.drop_duplicates()))
+    print(quitar_duplicados(df_csv_sin_pie, subset=['id', 'email']).shape)
+#%% en streaming: presupuesto de memoria, filtro de Bloom y corridas en disco
+    with DeduplicadorStreaming(presupuesto_bytes=20_000, esperadas=1_000) as dedup:
+        df_imc2 = procesar_csv('dataset_pandas.csv', tamano_bloque=100, pie=1, deduplicador=dedup)
+        print(dedup)
+    print(df_imc2.equals(df_imc))
+# %%
@@ -24,6 +24,24 @@ print(f'\nAlturas 3 aleatorios: \n{altura.sample(3)}') # n aleatorios
 altura.sort_values() # ordena ascendente
 altura.sort_values(ascending=False) # ordena descendente
 altura.sort_index(ascending=False) # ordena por índice
+#%% ordenar una sola vez: el accesor .orden guarda el argsort y lo reutiliza
+import pandas_orden_cache  # registra altura.orden
+
+print(f'\nAscendente: \n{altura.orden.sort_values()}')              # ordena y guarda
+print(f'\nDescendente: \n{altura.orden.sort_values(ascending=False)}')  # O(n), sin reordenar
+print(f'\nPor índice: \n{altura.orden.sort_index(ascending=False)}')
+print(f'Mediana: {altura.orden.median()}  Cuartil 3: {altura.orden.quantile(0.75)}')
+print(altura.orden.sort_values(ascending=False).equals(altura.sort_values(ascending=False)))
+
+altura[0] = 200   # modificar la serie invalida el orden guardado
+print(altura.orden.max(), altura.orden.median() == altura.median())
+altura[0] = 178
+#%% top-k: los k primeros sin ordenar toda la serie (np.partition, O(n))
+from pandas_top_k import top_k
+
+print(f'\n3 más bajos: \n{top_k(altura, 3)}')
+print(f'\n3 más altos: \n{top_k(altura, 3, ascending=False)}')
+print(top_k(altura, 3, ascending=False).equals(altura.sort_values(ascending=False).head(3)))
 #%% Estadísticas
 print(f'Count (válidos): {altura.count()}')
 print(f'Promedio:        {altura.mean()}')
@@ -35,6 +53,13 @@ print(f'Mediana:         {altura.median()}')
 
 print(f'\nDescriptivas: \n{altura.describe()}\n')
 altura.info()
+#%% Estadísticas fusionadas: todo lo anterior con un solo np.partition
+from pandas_estadisticas import describir
+
+resumen = describir(altura, incluir_suma=True)
+print(f'\nDescriptivas + suma: \n{resumen}')
+print(f'Mediana: {resumen["50%"]}')
+print(np.allclose(resumen.drop('sum'), altura.describe(), rtol=1e-12, equal_nan=True))   # mean/std: últimos bits
 
 #%%
 altura2 = altura_cm.copy()
@@ -81,7 +106,11 @@ print(f'Filtrado: \n {filtrado}')
 print(f'\nDescribe: \n {filtrado.describe()}')
 print(f'\n Edad máxima: {filtrado['edad'].max()}')
 #%% creamos nuevo df amigos desde archivo excel
-amigos = pd.read_excel('./amigos.xlsx', index_col='Id')
+# leer_excel guarda lo leído en .cache_lectura/ (Parquet) y, mientras el
+# archivo no cambie, las siguientes ejecuciones no vuelven a abrir el Excel
+from pandas_cache_lectura import leer_excel
+
+amigos = leer_excel('./amigos.xlsx', index_col='Id')
 amigos
 #%%
 amigos.describe()
@@ -96,7 +125,7 @@ condicion = amigos['Edad'] < edad
 filtro = amigos[condicion]
 filtro
 # %% creamos df universidad desde archivo excel
-universidad = pd.read_excel('./universidad.xlsx', index_col='Id Persona', parse_dates=['Inscripción'])
+universidad = leer_excel('./universidad.xlsx', index_col='Id Persona', parse_dates=['Inscripción'])
 universidad
 #%%
 universidad.head()
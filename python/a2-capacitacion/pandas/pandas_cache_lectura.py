@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Caché de lectura: el primer read_excel/read_csv se guarda en binario y los siguientes se leen de ahí
+@author: Alex Ballera
+"""
+#%%
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET = True
+except ImportError:
+    PARQUET = False
+
+DIRECTORIO_CACHE = '.cache_lectura'
+
+#%% ===========================================================================
+# Entradas del caché
+# =============================================================================
+def _clave(ruta, lector, opciones):
+    """Nombre de la entrada: depende del archivo, del lector y de las opciones, no de la fecha.
+
+    Así una misma lectura siempre cae en la misma entrada y, si el archivo
+    cambió, se sobrescribe en lugar de dejar versiones viejas acumuladas.
+    """
+    texto = json.dumps([str(ruta), lector, opciones, pd.__version__], sort_keys=True, default=repr)
+    return hashlib.sha1(texto.encode('utf-8')).hexdigest()[:20]
+
+
+def _firma(ruta):
+    estado = os.stat(ruta)
+    return {'mtime_ns': estado.st_mtime_ns, 'tamano': estado.st_size}
+
+
+def _identicos(a, b):
+    """Mismos valores, mismos dtypes y mismo índice (`equals` no mira el tipo del índice)."""
+    return (a.equals(b) and a.dtypes.equals(b.dtypes)
+            and a.index.equals(b.index) and a.index.dtype == b.index.dtype
+            and a.columns.equals(b.columns) and a.columns.dtype == b.columns.dtype)
+
+
+def _escribir(datos, destino):
+    """Guarda en Parquet si los datos vuelven idénticos (tipos e índice); si no, en pickle.
+
+    Parquet no conserva todo: p. ej. columnas `object` con texto vuelven
+    como `str`. Por eso se relee el archivo recién escrito y, si algo
+    cambió, se usa pickle, que devuelve exactamente el mismo objeto.
+    """
+    temporal = destino.with_suffix('.tmp')
+    if PARQUET and isinstance(datos, pd.DataFrame):
+        try:
+            datos.to_parquet(temporal)
+            if _identicos(pd.read_parquet(temporal), datos):
+                os.replace(temporal, destino.with_suffix('.parquet'))
+                return 'parquet'
+        except (ValueError, TypeError, pyarrow.ArrowException):
+            pass   # p. ej. columnas object con tipos mezclados
+    pd.to_pickle(datos, temporal)
+    os.replace(temporal, destino.with_suffix('.pkl'))
+    return 'pkl'
+
+
+def _leer(destino, formato):
+    if formato == 'parquet':
+        return pd.read_parquet(destino.with_suffix('.parquet'))
+    return pd.read_pickle(destino.with_suffix('.pkl'))
+
+
+def _borrar(destino):
+    for sufijo in ('.json', '.parquet', '.pkl', '.tmp'):
+        destino.with_suffix(sufijo).unlink(missing_ok=True)
+
+#%% ===========================================================================
+# Lectura a través del caché
+# =============================================================================
+def leer_cacheado(lector, ruta, directorio=None, **opciones):
+    """Como `lector(ruta, **opciones)`, pero lee de un caché binario si el archivo no cambió.
+
+    La entrada se identifica por ruta absoluta, lector y opciones de
+    lectura (`sheet_name`, `usecols`, `skipfooter`, `parse_dates`...) y
+    guarda la fecha de modificación (en ns) y el tamaño del archivo: si
+    alguno cambió, se vuelve a leer el original y se reemplaza la entrada.
+    Por defecto el caché va en una carpeta `.cache_lectura` junto al
+    archivo.
+
+    >>> amigos = leer_cacheado(pd.read_excel, './amigos.xlsx', index_col='Id')
+    """
+    ruta = Path(ruta).resolve()
+    nombre = lector if isinstance(lector, str) else lector.__name__
+    funcion = getattr(pd, lector) if isinstance(lector, str) else lector
+    carpeta = Path(directorio) if directorio else ruta.parent / DIRECTORIO_CACHE
+    destino = carpeta / _clave(ruta, nombre, opciones)
+    firma = _firma(ruta)
+
+    meta = destino.with_suffix('.json')
+    if meta.exists():
+        guardado = json.loads(meta.read_text(encoding='utf-8'))
+        if guardado['firma'] == firma:
+            try:
+                return _leer(destino, guardado['formato'])
+            except (OSError, ValueError):
+                pass   # entrada dañada: se regenera
+        _borrar(destino)
+
+    datos = funcion(ruta, **opciones)
+    carpeta.mkdir(parents=True, exist_ok=True)
+    formato = _escribir(datos, destino)
+    meta.write_text(json.dumps({'ruta': str(ruta), 'lector': nombre, 'firma': firma,
+                                'formato': formato}), encoding='utf-8')
+    return datos
+
+
+def leer_excel(ruta, directorio=None, **opciones):
+    """`pd.read_excel` con caché: openpyxl solo se usa la primera vez."""
+    return leer_cacheado('read_excel', ruta, directorio, **opciones)
+
+
+def leer_csv(ruta, directorio=None, **opciones):
+    return leer_cacheado('read_csv', ruta, directorio, **opciones)
+
+
+def limpiar_cache(directorio):
+    """Borra las entradas cuyo archivo original ya no existe o cambió; devuelve cuántas borró."""
+    borradas = 0
+    for meta in Path(directorio).glob('*.json'):
+        guardado = json.loads(meta.read_text(encoding='utf-8'))
+        ruta = Path(guardado['ruta'])
+        if not ruta.exists() or _firma(ruta) != guardado['firma']:
+            _borrar(meta.with_suffix(''))
+            borradas += 1
+    return borradas
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Estadísticas fusionadas: count, mean, std, min, cuartiles y max con un solo np.partition
+@author: Alex Ballera
+"""
+#%%
+import numpy as np
+import pandas as pd
+
+#%% ===========================================================================
+# Núcleo sobre arrays de NumPy
+# =============================================================================
+def _etiquetas(percentiles):
+    return [f'{q * 100:g}%' for q in percentiles]
+
+
+def _posiciones(m, percentiles):
+    """Posiciones (fraccionarias) de cada percentil en m valores ordenados, como `quantile`."""
+    posicion = np.asarray(percentiles, dtype=np.float64) * (m - 1)
+    abajo = np.floor(posicion).astype(np.intp)
+    arriba = np.minimum(abajo + 1, m - 1)
+    return abajo, arriba, posicion - abajo
+
+
+def cuantiles_lineales(ordenados, percentiles):
+    """Cuantiles con interpolación lineal a lo largo del eje 0, bit a bit como `np.quantile`.
+
+    Solo hace falta que los vecinos de cada percentil estén en su posición
+    (alcanza con un `np.partition`). Se interpola desde el extremo más
+    cercano, como NumPy: `b - (b - a)·(1 - t)` si t >= 0.5 y `a + (b - a)·t`
+    si no; la fórmula `a + (b - a)·t` sola difiere a veces en el último bit.
+    """
+    abajo, arriba, fraccion = _posiciones(ordenados.shape[0], percentiles)
+    fraccion = fraccion.reshape(fraccion.shape + (1,) * (ordenados.ndim - 1))
+    bajos = np.asarray(ordenados[abajo], dtype=np.float64)
+    altos = np.asarray(ordenados[arriba], dtype=np.float64)
+    diferencia = altos - bajos
+    return np.where(fraccion >= 0.5, altos - diferencia * (1 - fraccion), bajos + diferencia * fraccion)
+
+
+def _resumir(bloque, percentiles):
+    """Estadísticas por columna de un array 2D sin NaN (una fila por observación).
+
+    Un solo `np.partition` deja en su lugar el mínimo, el máximo y los
+    valores vecinos de cada percentil: no hace falta ordenar (O(n) en vez de
+    O(n log n)). Después hay dos recorridos más del array particionado, uno
+    para la suma y otro para el desvío (dos pasadas, como pandas, que es
+    más estable que acumular la suma de cuadrados).
+    """
+    m = bloque.shape[0]
+    columnas = bloque.shape[1]
+    if m == 0:
+        nan = np.full(columnas, np.nan)
+        return np.zeros(columnas), nan, nan, nan, np.full((len(percentiles), columnas), np.nan), nan, np.zeros(columnas)
+    abajo, arriba, _ = _posiciones(m, percentiles)
+    kth = np.unique(np.concatenate(([0, m - 1], abajo, arriba)))
+    particion = np.partition(bloque, kth, axis=0)
+
+    suma = particion.sum(axis=0)
+    media = suma / m
+    desvio = np.sqrt(np.square(particion - media).sum(axis=0) / (m - 1)) if m > 1 else np.full(columnas, np.nan)
+    cuantiles = cuantiles_lineales(particion, percentiles)
+    return np.full(columnas, float(m)), media, desvio, particion[0], cuantiles, particion[m - 1], suma
+
+#%% ===========================================================================
+# Series y DataFrames
+# =============================================================================
+def describir(serie, percentiles=(0.25, 0.5, 0.75), incluir_suma=False):
+    """Como `serie.describe()` para Series numéricas, con un solo `np.partition` para los cuantiles.
+
+    En lugar de `count()`, `mean()`, `std()`, `min()`, `max()`, `median()` y
+    `describe()` por separado (cada uno recorre la serie y `describe`
+    además ordena para los cuartiles), se copia una vez los valores válidos
+    y se resuelve todo sobre esa copia: la copia, la partición, la suma y
+    el desvío son cuatro recorridos en total. La mediana es el percentil
+    '50%'. Con `incluir_suma=True` se agrega la fila 'sum' al final.
+
+    count, min, max y los cuantiles coinciden exactamente con `describe()`.
+    mean y std suman en otro orden (sobre el array particionado) y pueden
+    diferir en los últimos bits (error relativo ~1e-15): para comparar,
+    `np.allclose` y no `.equals`.
+    """
+    valores = serie.to_numpy(dtype=np.float64, na_value=np.nan)
+    valores = valores[~np.isnan(valores)]
+    n, media, desvio, minimo, cuantiles, maximo, suma = _resumir(valores[:, None], percentiles)
+
+    datos = [n[0], media[0], desvio[0], minimo[0], *cuantiles[:, 0], maximo[0]]
+    indice = ['count', 'mean', 'std', 'min', *_etiquetas(percentiles), 'max']
+    if incluir_suma:
+        datos.append(suma[0])
+        indice.append('sum')
+    return pd.Series(datos, index=indice, name=serie.name, dtype=np.float64)
+
+
+def describir_df(df, percentiles=(0.25, 0.5, 0.75), incluir_suma=False):
+    """Igual que `df.describe()` (columnas numéricas) resolviendo todas las columnas juntas.
+
+    Las columnas sin NaN se procesan como un único array 2D: un
+    `np.partition(axis=0)` y reducciones vectorizadas para cientos de
+    columnas a la vez. Las que tienen NaN tienen distinta cantidad de
+    valores válidos y se resuelven una por una con `describir`. Misma
+    tolerancia que `describir` en mean y std.
+    """
+    numericas = df.select_dtypes(include='number', exclude='bool')
+    indice = ['count', 'mean', 'std', 'min', *_etiquetas(percentiles), 'max']
+    if incluir_suma:
+        indice.append('sum')
+    resultado = pd.DataFrame(index=indice, columns=numericas.columns, dtype=np.float64)
+
+    valores = numericas.to_numpy(dtype=np.float64, na_value=np.nan)
+    con_nan = np.isnan(valores).any(axis=0)
+    completas = np.flatnonzero(~con_nan)
+    if completas.size:
+        n, media, desvio, minimo, cuantiles, maximo, suma = _resumir(valores[:, completas], percentiles)
+        filas = [n, media, desvio, minimo, *cuantiles, maximo]
+        if incluir_suma:
+            filas.append(suma)
+        resultado.iloc[:, completas] = np.vstack(filas)
+    for j in np.flatnonzero(con_nan):
+        resultado.iloc[:, j] = describir(numericas.iloc[:, j], percentiles, incluir_suma).to_numpy()
+    return resultado
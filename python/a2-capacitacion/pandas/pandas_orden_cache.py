@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Orden cacheado por Series: un solo argsort para sort_values, sort_index, mediana y cuantiles
+@author: Alex Ballera
+"""
+#%%
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from pandas_estadisticas import cuantiles_lineales
+
+#%% ===========================================================================
+# Permutaciones
+# =============================================================================
+def _invertir_estable(orden, ordenados):
+    """Pasa una permutación ascendente estable a descendente estable en O(n).
+
+    Invertir `orden` entero también invertiría el orden de los empates;
+    en cambio se invierte el orden de los grupos de valores iguales y
+    dentro de cada grupo se conserva el orden original (como pandas con
+    `kind='stable'`).
+    """
+    m = orden.size
+    if m == 0:
+        return orden
+    nuevo_grupo = np.empty(m, dtype=bool)
+    nuevo_grupo[0] = True
+    np.not_equal(ordenados[1:], ordenados[:-1], out=nuevo_grupo[1:])
+    inicios = np.flatnonzero(nuevo_grupo)
+    tamanos = np.diff(np.append(inicios, m))
+    grupo = np.cumsum(nuevo_grupo) - 1
+    posicion = np.arange(m)
+    destino = (m - inicios[grupo] - tamanos[grupo]) + (posicion - inicios[grupo])
+    descendente = np.empty_like(orden)
+    descendente[destino] = orden
+    return descendente
+
+
+def _argsort_estable(valores):
+    """(orden de los válidos, valores ordenados, posiciones NaN) como sort_values(kind='stable')."""
+    es_nan = pd.isna(valores)
+    validos = np.flatnonzero(~es_nan)
+    orden = validos[np.argsort(valores[validos], kind='stable')]
+    return orden, valores[orden], np.flatnonzero(es_nan)
+
+
+def _sigue_ordenando(valores, orden, nans):
+    """¿`orden` sigue siendo el argsort estable de `valores`? Devuelve los valores ordenados o None.
+
+    El argsort estable es único: si al aplicar la permutación guardada los
+    valores quedan en orden no decreciente, con los empates en orden de
+    posición y los NaN donde estaban, es exactamente el que se obtendría
+    ordenando de nuevo. Cuesta una lectura O(n), sin ordenar ni hashear.
+    """
+    if orden.size + nans.size != valores.size:
+        return None
+    es_nan = pd.isna(valores)
+    if es_nan.sum() != nans.size or not es_nan[nans].all():
+        return None
+    ordenados = valores[orden]
+    if ordenados.size > 1:
+        siguiente, anterior = ordenados[1:], ordenados[:-1]
+        if not ((siguiente > anterior) | ((siguiente == anterior) & (orden[1:] > orden[:-1]))).all():
+            return None
+    return ordenados
+
+#%% ===========================================================================
+# Caché por objeto Series
+# =============================================================================
+# pandas crea un accesor nuevo en cada `serie.orden`, así que el orden se
+# guarda aparte, por id de la Series, y se borra cuando la Series se libera
+_ORDENES = {}
+
+
+def _estado(serie):
+    clave = id(serie)
+    entrada = _ORDENES.get(clave)
+    if entrada is None or entrada[0]() is not serie:
+        referencia = weakref.ref(serie, lambda _, clave=clave: _ORDENES.pop(clave, None))
+        entrada = _ORDENES[clave] = (referencia, {})
+    return entrada[1]
+
+#%% ===========================================================================
+# Accesor: altura.orden.sort_values(), altura.orden.median(), ...
+# =============================================================================
+@pd.api.extensions.register_series_accessor('orden')
+class OrdenCacheado:
+    """Guarda el argsort de una Series y lo reutiliza mientras la Series no cambie.
+
+    El orden queda asociado al objeto Series (no al accesor, que pandas
+    vuelve a crear en cada acceso):
+
+    >>> altura.orden.sort_values()                 # ordena (O(n log n)) y guarda
+    >>> altura.orden.sort_values(ascending=False)  # reutiliza: O(n)
+    >>> altura.orden.median(), altura.orden.quantile(0.9)
+
+    Antes de reutilizarlo se comprueba en O(n) que la permutación guardada
+    siga ordenando los valores actuales (ver `_sigue_ordenando`); si la
+    Series se modificó y ya no los ordena, se vuelve a ordenar. Con
+    `verificar=False` se omite la comprobación y las consultas de
+    cuantiles cuestan O(1).
+    """
+    def __init__(self, serie):
+        self._serie = serie
+        self._cache = _estado(serie)
+
+    def invalidar(self):
+        self._cache.clear()
+
+    def _orden_valores(self, verificar):
+        cache = self._cache
+        if 'valores' in cache:
+            orden, ordenados, nans = cache['valores']
+            if not verificar:
+                return orden, ordenados, nans
+            actuales = _sigue_ordenando(self._serie.to_numpy(), orden, nans)
+            if actuales is not None:
+                if not np.array_equal(actuales, ordenados):
+                    # mismo orden pero otros valores: pueden cambiar los empates del descendente
+                    cache.pop('descendente', None)
+                    cache['valores'] = orden, actuales, nans
+                return orden, actuales, nans
+            self.invalidar()
+        cache['valores'] = _argsort_estable(self._serie.to_numpy())
+        return cache['valores']
+
+    def _orden_indice(self, verificar):
+        cache = self._cache
+        indice = self._serie.index.to_numpy()
+        if 'indice' in cache:
+            orden, ordenados, nans = cache['indice']
+            if not verificar or _sigue_ordenando(indice, orden, nans) is not None:
+                return orden, indice[orden], nans
+        cache['indice'] = _argsort_estable(indice)
+        return cache['indice']
+
+    # ---------------------------------------------------------------- orden
+    def argsort(self, ascending=True, verificar=True):
+        """Posiciones que ordenan la Series (NaN al final, empates estables)."""
+        orden, ordenados, nans = self._orden_valores(verificar)
+        if ascending:
+            return np.concatenate((orden, nans))
+        if 'descendente' not in self._cache:
+            self._cache['descendente'] = _invertir_estable(orden, ordenados)
+        return np.concatenate((self._cache['descendente'], nans))
+
+    def sort_values(self, ascending=True, verificar=True):
+        return self._serie.take(self.argsort(ascending, verificar))
+
+    def sort_index(self, ascending=True, verificar=True):
+        orden, ordenados, nans = self._orden_indice(verificar)
+        if not ascending:
+            orden = _invertir_estable(orden, ordenados)
+        return self._serie.take(np.concatenate((orden, nans)))
+
+    # ------------------------------------------------------ estadísticos de orden
+    def quantile(self, q=0.5, verificar=True):
+        """Cuantil con interpolación lineal, como `Series.quantile` por defecto (ver `cuantiles_lineales`)."""
+        _, ordenados, _ = self._orden_valores(verificar)
+        if ordenados.size == 0:
+            return np.nan
+        resultado = cuantiles_lineales(ordenados, q)
+        if np.ndim(q):
+            return pd.Series(resultado, index=np.asarray(q, dtype=np.float64), name=self._serie.name)
+        return float(resultado)
+
+    def median(self, verificar=True):
+        return self.quantile(0.5, verificar)
+
+    def min(self, verificar=True):
+        _, ordenados, _ = self._orden_valores(verificar)
+        return ordenados[0] if ordenados.size else np.nan
+
+    def max(self, verificar=True):
+        _, ordenados, _ = self._orden_valores(verificar)
+        return ordenados[-1] if ordenados.size else np.nan
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Top-k sin ordenar todo: los k menores/mayores con np.partition en O(n)
+@author: Alex Ballera
+"""
+#%%
+import numpy as np
+import pandas as pd
+
+#%% ===========================================================================
+# Arrays de NumPy
+# =============================================================================
+def _candidatos(valores, k, ascendente):
+    """Posiciones (en orden original) que pueden quedar entre los k primeros.
+
+    Son las estrictamente mejores que el k-ésimo valor más todas las que lo
+    empatan, y los NaN si no alcanzan los valores válidos. Se encuentra el
+    k-ésimo con `np.partition` (O(n)); el resto es una pasada de comparación.
+    """
+    valores = np.asarray(valores)
+    if k <= 0:
+        return np.arange(0)
+    validos = ~pd.isna(valores)
+    n_validos = int(validos.sum())
+    if n_validos <= k:
+        return np.arange(valores.size)   # entran todos los válidos y hacen falta NaN
+
+    v = valores[validos]
+    if ascendente:
+        kesimo = np.partition(v, k - 1)[k - 1]
+        mejores = v <= kesimo
+    else:
+        kesimo = np.partition(v, v.size - k)[v.size - k]
+        mejores = v >= kesimo
+    return np.flatnonzero(validos)[mejores]
+
+
+def _ordenar_candidatos(valores, candidatos, ascendente):
+    """Ordena los candidatos por valor (NaN al final) y, ante empates, por posición."""
+    seleccion = valores[candidatos]
+    es_nan = pd.isna(seleccion)
+    if seleccion.dtype.kind == 'f':
+        clave = np.where(es_nan, 0, seleccion)
+        clave = clave if ascendente else -clave
+    else:
+        # ~x invierte el orden de los enteros sin desbordar (a diferencia de -x)
+        clave = seleccion if ascendente else ~seleccion
+    return candidatos[np.lexsort((candidatos, clave, es_nan))]
+
+
+def k_menores(valores, k):
+    """Posiciones de los k valores más chicos, ordenadas (empates por posición, NaN al final)."""
+    valores = np.asarray(valores)
+    return _ordenar_candidatos(valores, _candidatos(valores, k, True), True)[:k]
+
+
+def k_mayores(valores, k):
+    """Posiciones de los k valores más grandes, de mayor a menor (empates por posición, NaN al final)."""
+    valores = np.asarray(valores)
+    return _ordenar_candidatos(valores, _candidatos(valores, k, False), False)[:k]
+
+#%% ===========================================================================
+# Series y DataFrames
+# =============================================================================
+def top_k(datos, k, by=None, ascending=True):
+    """Igual que `datos.sort_values(by, ascending=ascending, kind='stable').head(k)`.
+
+    Acepta Series o DataFrame y una o varias columnas en `by` (como
+    `['edad', 'IMC']`). La primera columna numérica reduce las filas a los
+    candidatos con `np.partition` y solo esos se ordenan por todas las
+    claves: O(n + c log c) en lugar de O(n log n), con c ≈ k salvo que haya
+    muchos empates en la primera clave. Si la primera clave no es numérica
+    se ordena todo como siempre.
+    """
+    es_serie = isinstance(datos, pd.Series)
+    if not es_serie and by is None:
+        raise TypeError('top_k sobre un DataFrame necesita `by`: la columna o columnas por las que ordenar')
+    if k <= 0:
+        return datos.iloc[:0]
+    claves = [by] if isinstance(by, str) else list(by or [])
+    if not es_serie and not claves:   # sort_values(by=[]) deja el orden como está
+        return datos.head(k)
+    primera = datos if es_serie else datos[claves[0]]
+    ascendente = ascending if isinstance(ascending, bool) else ascending[0]
+
+    def ordenar(parte):
+        if isinstance(parte, pd.Series):
+            return parte.sort_values(ascending=ascending, kind='stable')
+        return parte.sort_values(claves, ascending=ascending, kind='stable')
+
+    if not pd.api.types.is_numeric_dtype(primera.dtype) or pd.api.types.is_bool_dtype(primera.dtype):
+        return ordenar(datos).head(k)
+
+    candidatos = _candidatos(primera.to_numpy(dtype=np.float64, na_value=np.nan), k, ascendente)
+    return ordenar(datos.iloc[candidatos]).head(k)
+
+
+def k_menores_df(datos, k, by=None):
+    return top_k(datos, k, by, ascending=True)
+
+
+def k_mayores_df(datos, k, by=None):
+    return top_k(datos, k, by, ascending=False)
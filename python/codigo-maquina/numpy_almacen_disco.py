@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Almacén de arrays en disco (.npy con el encabezado en el mismo archivo) abierto con np.memmap
+@author: Alex Ballera
+"""
+#%%
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+VERSION = 1
+
+#%% ===========================================================================
+# Rutas y archivos temporales
+# =============================================================================
+def _rutas(directorio, nombre):
+    directorio = Path(directorio)
+    return directorio / f'{nombre}.bin', directorio / f'{nombre}.json'
+
+
+def _ruta_npy(directorio, nombre):
+    return Path(directorio) / f'{nombre}.npy'
+
+
+def _umask():
+    mascara = os.umask(0)
+    os.umask(mascara)
+    return mascara
+
+
+def _temporal(ruta):
+    """Archivo temporal en la misma carpeta que `ruta` (os.replace es atómico solo ahí).
+
+    mkstemp lo crea con permisos 0600; se le dan los de un archivo común
+    (0666 menos la umask) para que otros usuarios puedan leer lo publicado.
+    """
+    descriptor, nombre = tempfile.mkstemp(dir=ruta.parent, prefix=f'.{ruta.name}.', suffix='.tmp')
+    os.close(descriptor)
+    os.chmod(nombre, 0o666 & ~_umask())
+    return Path(nombre)
+
+
+def _publicar(temporal, directorio, nombre):
+    """Un solo `os.replace`: datos y encabezado viajan en el mismo .npy.
+
+    Después se borra la versión .bin + .json anterior, si la había, que
+    `abrir` ya no usa porque el .npy tiene prioridad.
+    """
+    os.replace(temporal, _ruta_npy(directorio, nombre))
+    for ruta in _rutas(directorio, nombre):
+        ruta.unlink(missing_ok=True)
+
+
+def _encabezado_npy(dtype, forma):
+    return {'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)), 'fortran_order': False, 'shape': forma}
+
+
+def leer_encabezado(directorio, nombre):
+    """Encabezado JSON de los archivos .bin + .json (formato anterior al .npy)."""
+    _, ruta_json = _rutas(directorio, nombre)
+    encabezado = json.loads(ruta_json.read_text())
+    if encabezado.get('version') != VERSION:
+        raise ValueError(f'{ruta_json}: versión de encabezado no soportada {encabezado.get("version")}')
+    return encabezado
+
+#%% ===========================================================================
+# Escritura
+# =============================================================================
+def guardar(directorio, nombre, arr):
+    """Guarda `arr` como `<nombre>.npy`: encabezado (dtype, forma) y bytes crudos en orden C."""
+    ruta = _ruta_npy(directorio, nombre)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    temporal = _temporal(ruta)
+    try:
+        with open(temporal, 'wb') as archivo:
+            np.save(archivo, np.asarray(arr), allow_pickle=False)
+    except BaseException:
+        temporal.unlink(missing_ok=True)
+        raise
+    _publicar(temporal, directorio, nombre)
+    return ruta
+
+
+class EscritorPorBloques:
+    """Escribe un array más grande que la RAM agregando bloques de filas.
+
+    Los bloques van a un .npy temporal en la misma carpeta; el archivo
+    anterior (si había) sigue intacto y legible mientras tanto. El
+    encabezado se escribe al abrir con 0 filas y al cerrar se reescribe en
+    su lugar con la cantidad final (NumPy deja espacio para que la forma
+    crezca sin cambiar el largo del encabezado). Recién entonces un solo
+    `os.replace` publica datos y encabezado juntos. Si el bloque `with`
+    termina con una excepción se borra el temporal y no se publica nada.
+
+    >>> with EscritorPorBloques('datos', 'altura', np.float64) as escritor:
+    ...     for bloque in bloques:
+    ...         escritor.agregar(bloque)
+    """
+    def __init__(self, directorio, nombre, dtype, forma_fila=()):
+        self.directorio, self.nombre = Path(directorio), nombre
+        self.ruta = _ruta_npy(directorio, nombre)
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        self.dtype = np.dtype(dtype)
+        self.forma_fila = tuple(forma_fila)
+        self.filas = 0
+        self._temporal = _temporal(self.ruta)
+        self._archivo = open(self._temporal, 'wb')
+        np.lib.format.write_array_header_1_0(self._archivo, _encabezado_npy(self.dtype, (0, *self.forma_fila)))
+        self._largo_encabezado = self._archivo.tell()
+
+    def agregar(self, bloque):
+        bloque = np.asarray(bloque, dtype=self.dtype)
+        if bloque.shape[1:] != self.forma_fila:
+            raise ValueError(f'cada fila debe tener forma {self.forma_fila}, no {bloque.shape[1:]}')
+        np.ascontiguousarray(bloque).tofile(self._archivo)
+        self.filas += bloque.shape[0]
+
+    def cerrar(self):
+        """Completa el encabezado y publica lo escrito como `<nombre>.npy`."""
+        if self._archivo.closed:
+            return
+        try:
+            self._archivo.seek(0)
+            np.lib.format.write_array_header_1_0(self._archivo,
+                                                 _encabezado_npy(self.dtype, (self.filas, *self.forma_fila)))
+            if self._archivo.tell() != self._largo_encabezado:
+                raise ValueError(f'el encabezado de {self.filas:,} filas no entra en el espacio reservado')
+            self._archivo.close()
+        except BaseException:
+            self.descartar()
+            raise
+        _publicar(self._temporal, self.directorio, self.nombre)
+
+    def descartar(self):
+        """Abandona la escritura: borra el temporal y deja el archivo anterior como estaba."""
+        if not self._archivo.closed:
+            self._archivo.close()
+        self._temporal.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is None:
+            self.cerrar()
+        else:
+            self.descartar()
+
+#%% ===========================================================================
+# Lectura
+# =============================================================================
+def abrir(directorio, nombre, modo='r'):
+    """Abre el array como `np.memmap`: no lee nada hasta que se accede a los datos.
+
+    Con `modo='r'` (solo lectura) el sistema operativo comparte las mismas
+    páginas entre todos los procesos que abren el archivo, sin duplicarlo
+    en memoria. Se abre `<nombre>.npy` con `np.load(mmap_mode=...)`; si no
+    existe, se busca el formato anterior `<nombre>.bin` + `<nombre>.json`.
+    """
+    ruta_npy = _ruta_npy(directorio, nombre)
+    if ruta_npy.exists():
+        return np.load(ruta_npy, mmap_mode=modo)
+
+    ruta_bin, _ = _rutas(directorio, nombre)
+    encabezado = leer_encabezado(directorio, nombre)
+    forma = tuple(encabezado['forma'])
+    if 0 in forma:   # np.memmap no admite archivos vacíos
+        return np.empty(forma, dtype=encabezado['dtype'])
+    return np.memmap(ruta_bin, dtype=encabezado['dtype'], mode=modo, shape=forma, order=encabezado['orden'])
+
+
+def existe(directorio, nombre):
+    ruta_bin, ruta_json = _rutas(directorio, nombre)
+    return _ruta_npy(directorio, nombre).exists() or (ruta_bin.exists() and ruta_json.exists())
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Almacenamiento compacto: elegir el dtype más angosto que conserva los datos
+@author: Alex Ballera
+"""
+#%%
+from dataclasses import dataclass
+
+import numpy as np
+
+# Candidatos enteros sin signo, del más angosto al más ancho
+_ENTEROS = (np.uint8, np.uint16, np.uint32)
+_FLOTANTES = (np.float16, np.float32)
+
+#%% ===========================================================================
+# Columna compacta
+# =============================================================================
+@dataclass
+class ColumnaCompacta:
+    """Columna guardada en un dtype angosto junto con lo necesario para expandirla.
+
+    Modo entero:  valor = (datos + base) / escala   (p. ej. altura en cm → escala 100)
+    Modo flotante: valor = datos                     (float16/float32)
+    Los NaN se guardan en modo entero con el valor `centinela`; las
+    columnas con ±inf solo se guardan en modo flotante.
+    """
+    datos: np.ndarray
+    dtype_original: np.dtype
+    tolerancia: float
+    escala: int = 1
+    base: int = 0
+    centinela: int | None = None
+
+    @property
+    def entero(self):
+        return self.datos.dtype.kind == 'u'
+
+    def expandir(self, dtype=None):
+        """Reconstruye la columna en `dtype` (por defecto el original)."""
+        dtype = self.dtype_original if dtype is None else np.dtype(dtype)
+        if not self.entero:
+            return self.datos.astype(dtype)
+        if dtype.kind in 'iu' and self.escala == 1 and self.centinela is None:
+            # columnas enteras: suma entera, exacta aunque `base` pase de 2**53
+            valores = self.datos.astype(dtype)
+            valores += dtype.type(self.base)
+            return valores
+
+        valores = self.datos.astype(np.float64)
+        valores += self.base
+        valores /= self.escala
+        if self.centinela is not None:
+            valores[self.datos == self.centinela] = np.nan
+        return valores.astype(dtype, copy=False)
+
+    @property
+    def nbytes(self):
+        return self.datos.nbytes
+
+    @property
+    def nbytes_original(self):
+        return self.datos.size * self.dtype_original.itemsize
+
+    @property
+    def bytes_ahorrados(self):
+        return self.nbytes_original - self.nbytes
+
+    @property
+    def factor(self):
+        return self.nbytes_original / self.nbytes if self.nbytes else np.inf
+
+    def reporte(self, nombre='columna'):
+        modo = f'escala={self.escala}, base={self.base}' if self.entero else 'flotante'
+        return (f'{nombre}: {self.dtype_original} → {self.datos.dtype} ({modo}) '
+                f'{self.nbytes_original:,} → {self.nbytes:,} bytes, '
+                f'ahorro {self.bytes_ahorrados:,} bytes ({self.factor:.1f}x)')
+
+#%% ===========================================================================
+# Selección del dtype
+# =============================================================================
+def _dentro_de_tolerancia(original, reconstruido, tolerancia):
+    finitos = np.isfinite(original)
+    # NaN y ±inf tienen que volver exactamente iguales
+    if not np.array_equal(original[~finitos], reconstruido[~finitos], equal_nan=True):
+        return False
+    error = np.abs(reconstruido[finitos] - original[finitos])
+    return error.size == 0 or bool(error.max() <= tolerancia)
+
+
+def _candidato_entero(valores, escala, tolerancia):
+    """Intenta cuantizar `valores * escala` a un entero sin signo angosto."""
+    if np.isinf(valores).any():   # sin centinela para ±inf: que lo resuelvan los flotantes
+        return None
+    validos = ~np.isnan(valores)
+    hay_nan = not validos.all()
+    cuantizados = np.rint(valores[validos] * escala)
+    if cuantizados.size == 0:
+        return None
+
+    base = int(cuantizados.min())
+    rango = int(cuantizados.max()) - base
+    for dtype in _ENTEROS:
+        maximo = np.iinfo(dtype).max
+        if rango < maximo or (rango == maximo and not hay_nan):
+            break
+    else:
+        return None
+
+    datos = np.full(valores.shape, np.iinfo(dtype).max, dtype=dtype)
+    datos[validos] = cuantizados - base
+    columna = ColumnaCompacta(datos, valores.dtype, tolerancia, escala, base,
+                              np.iinfo(dtype).max if hay_nan else None)
+    if _dentro_de_tolerancia(valores, columna.expandir(np.float64), tolerancia):
+        return columna
+    return None
+
+
+def _compactar_enteros(valores, tolerancia):
+    """Columnas enteras: resta el mínimo y usa el uint más angosto, con aritmética entera exacta."""
+    mejor = ColumnaCompacta(valores, valores.dtype, tolerancia)
+    if valores.size == 0:
+        return mejor
+    base = int(valores.min())
+    rango = int(valores.max()) - base
+    for dtype in _ENTEROS:
+        if np.dtype(dtype).itemsize >= valores.itemsize:
+            break
+        if rango <= np.iinfo(dtype).max:
+            datos = (valores - valores.dtype.type(base)).astype(dtype)
+            return ColumnaCompacta(datos, valores.dtype, tolerancia, 1, base)
+    return mejor
+
+
+def compactar(valores, tolerancia=0.0, max_decimales=4):
+    """Guarda `valores` en el dtype más angosto que respeta `tolerancia`.
+
+    Prueba enteros sin signo escalados por 10**k (k = 0..max_decimales),
+    restando el mínimo para achicar el rango (alturas 1.59..1.84 m pasan a
+    0..25 cm → uint8), y también float16/float32. Con `tolerancia=0` solo
+    acepta representaciones que reconstruyen exactamente los valores.
+    Gana la de menor `itemsize`; ante empate, la primera encontrada.
+
+    Las columnas enteras siempre se guardan sin pérdida y `expandir()` las
+    devuelve en su dtype original.
+    """
+    valores = np.asarray(valores)
+    if valores.dtype.kind in 'iu':
+        return _compactar_enteros(valores, tolerancia)
+    if valores.dtype.kind != 'f':
+        raise TypeError(f'solo se compactan columnas numéricas, no {valores.dtype}')
+
+    mejor = ColumnaCompacta(valores, valores.dtype, tolerancia)
+    for decimales in range(max_decimales + 1):
+        columna = _candidato_entero(valores, 10**decimales, tolerancia)
+        if columna is not None and columna.datos.itemsize < mejor.datos.itemsize:
+            mejor = columna
+
+    for dtype in _FLOTANTES:
+        if np.dtype(dtype).itemsize >= mejor.datos.itemsize:
+            break
+        with np.errstate(over='ignore'):
+            datos = valores.astype(dtype)
+        if _dentro_de_tolerancia(valores, datos.astype(np.float64), tolerancia):
+            mejor = ColumnaCompacta(datos, valores.dtype, tolerancia)
+            break
+
+    return mejor
+
+
+def reporte_memoria(columnas):
+    """Imprime el ahorro de un dict {nombre: ColumnaCompacta} y lo devuelve en bytes."""
+    for nombre, columna in columnas.items():
+        print(columna.reporte(nombre))
+    original = sum(c.nbytes_original for c in columnas.values())
+    compacto = sum(c.nbytes for c in columnas.values())
+    print(f'Total: {original:,} → {compacto:,} bytes ({original / compacto:.1f}x)')
+    return original - compacto
@@ -69,4 +69,42 @@ for i in range(alturas.size):
     imc_for.append(pesos[i]/(alturas[i]*alturas[i]))  
 print(sum(imc_for) /len(imc_for))
 
-#%%
\ No newline at end of file
+#%% Mismo bucle acumulando en un buffer tipado en lugar de una lista
+from numpy_buffer_creciente import BufferCreciente
+
+imc_buffer = BufferCreciente(np.float64)
+for i in range(alturas.size):
+    imc_buffer.append(pesos[i]/(alturas[i]*alturas[i]))
+print(imc_buffer.view().mean(), len(imc_buffer), imc_buffer.capacidad)
+
+#%% IMC por bloques: misma media sin materializar el array completo
+from numpy_imc import bloques_de_arrays, imc_por_bloques
+
+resumen = imc_por_bloques(bloques_de_arrays(pesos, alturas, 32), tamano_bloque=32)
+print(resumen.media, resumen.minimo, resumen.maximo)
+
+#%% Almacenamiento compacto: alturas en cm y pesos en décimas de kg (100 g) sin pérdida
+from numpy_almacenamiento_compacto import compactar, reporte_memoria
+
+alturas_c = compactar(alturas)
+pesos_c = compactar(pesos)
+reporte_memoria({'alturas': alturas_c, 'pesos': pesos_c})
+print(np.array_equal(alturas_c.expandir(), alturas), np.array_equal(pesos_c.expandir(), pesos))
+
+# Con una tolerancia declarada se acepta perder precisión (kg enteros o float16/float32)
+print(compactar(pesos, tolerancia=0.5).reporte('pesos ±0.5 kg'))
+
+#%% Almacén en disco: se guarda una vez y se abre con np.memmap (lectura perezosa)
+from pathlib import Path
+
+from numpy_almacen_disco import abrir, existe, guardar
+
+directorio_datos = Path(__file__).with_name('datos') if '__file__' in globals() else Path('datos')
+for nombre, datos in (('alturas', alturas), ('pesos', pesos)):
+    if not existe(directorio_datos, nombre):
+        guardar(directorio_datos, nombre, datos)
+
+alturas_disco = abrir(directorio_datos, 'alturas')   # solo lectura, compartible entre procesos
+pesos_disco = abrir(directorio_datos, 'pesos')
+print(type(alturas_disco), np.array_equal(alturas_disco, alturas))
+print(imc_por_bloques(bloques_de_arrays(pesos_disco, alturas_disco, 32)).media)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Buffer tipado que crece por duplicación: reemplazo de list.append + np.array(lista)
+@author: Alex Ballera
+"""
+#%%
+from itertools import islice
+
+import numpy as np
+
+#%% ===========================================================================
+# Buffer creciente
+# =============================================================================
+class BufferCreciente:
+    """Arreglo de NumPy de tamaño variable con `append`/`extend` en O(1) amortizado.
+
+    Guarda los valores en un array con capacidad de sobra; cuando se llena
+    se reserva uno del doble y se copian los datos (cada elemento se copia
+    en promedio una vez). A diferencia de una lista, cada valor ocupa
+    `itemsize` bytes y no un objeto de Python de 24-32 bytes más el puntero.
+
+    >>> imc_buffer = BufferCreciente(np.float64)
+    >>> imc_buffer.append(81.4 / (1.74 * 1.74))
+    >>> imc_buffer.view().mean()
+    """
+    def __init__(self, dtype=np.float64, capacidad=16, forma_fila=()):
+        self._datos = np.empty((max(capacidad, 1), *forma_fila), dtype=dtype)
+        self._n = 0
+
+    def _reservar(self, necesario):
+        if necesario <= len(self._datos):
+            return
+        capacidad = max(2 * len(self._datos), necesario)
+        nuevos = np.empty((capacidad, *self._datos.shape[1:]), dtype=self._datos.dtype)
+        nuevos[:self._n] = self._datos[:self._n]
+        self._datos = nuevos
+
+    def append(self, valor):
+        if self._n == len(self._datos):
+            self._reservar(self._n + 1)
+        self._datos[self._n] = valor
+        self._n += 1
+
+    def extend(self, valores, tamano_lote=4096):
+        """Agrega muchos valores copiando bloques enteros en lugar de uno por uno.
+
+        Acepta arrays, listas o iterables sin largo conocido (generadores),
+        que se consumen en lotes de `tamano_lote` con `np.fromiter`.
+        """
+        if not hasattr(valores, '__len__'):
+            iterador = iter(valores)
+            while True:
+                lote = np.fromiter(islice(iterador, tamano_lote), dtype=self._datos.dtype)
+                if lote.size == 0:
+                    return
+                self.extend(lote)
+
+        valores = np.asarray(valores, dtype=self._datos.dtype)
+        fin = self._n + len(valores)
+        self._reservar(fin)
+        self._datos[self._n:fin] = valores
+        self._n = fin
+
+    def view(self):
+        """Vista (sin copia) de los valores cargados.
+
+        Deja de reflejar el buffer si después crece y se realoja: para
+        conservar los datos más allá de eso usar `to_array()`.
+        """
+        return self._datos[:self._n]
+
+    def to_array(self):
+        """Copia con el tamaño justo, independiente del buffer."""
+        return self._datos[:self._n].copy()
+
+    def clear(self):
+        self._n = 0
+
+    @property
+    def capacidad(self):
+        return len(self._datos)
+
+    @property
+    def nbytes(self):
+        return self._datos.nbytes
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, indice):
+        return self.view()[indice]
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def __repr__(self):
+        return f'BufferCreciente({self.view()!r}, capacidad={self.capacidad})'
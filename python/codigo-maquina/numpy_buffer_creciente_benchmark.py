@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: list.append + np.array(lista) contra BufferCreciente y array.array
+@author: Alex Ballera
+
+Uso:
+    python numpy_buffer_creciente_benchmark.py                 # 1 millón de appends
+    python numpy_buffer_creciente_benchmark.py --n 1e7
+
+Informa tiempo y pico de memoria (tracemalloc) por millón de valores hasta
+tener un array de NumPy listo para usar.
+"""
+#%%
+import argparse
+import time
+import tracemalloc
+from array import array
+
+import numpy as np
+
+from numpy_buffer_creciente import BufferCreciente
+
+#%%
+def con_lista(valores):
+    lista = []
+    for v in valores:
+        lista.append(v)
+    return np.array(lista)
+
+
+def con_array_array(valores):
+    buffer = array('d')
+    for v in valores:
+        buffer.append(v)
+    return np.frombuffer(buffer, dtype=np.float64)
+
+
+def con_buffer_append(valores):
+    buffer = BufferCreciente(np.float64)
+    for v in valores:
+        buffer.append(v)
+    return buffer.view()
+
+
+def con_buffer_extend(valores):
+    buffer = BufferCreciente(np.float64)
+    buffer.extend(valores)   # sin largo conocido: lotes con np.fromiter
+    return buffer.view()
+
+
+class Flotantes:
+    """Iterable reutilizable de n floats que no ocupa memoria."""
+    def __init__(self, n):
+        self.n = n
+
+    def __iter__(self):
+        return (float(v) for v in range(self.n))
+
+
+CASOS = {
+    'list.append + np.array': con_lista,
+    'array.array.append': con_array_array,
+    'BufferCreciente.append': con_buffer_append,
+    'BufferCreciente.extend': con_buffer_extend,
+}
+
+
+def medir(funcion, valores):
+    inicio = time.perf_counter()
+    funcion(valores)
+    segundos = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    resultado = funcion(valores)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultado
+    return segundos, pico
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n', type=lambda x: int(float(x)), default=1_000_000)
+    args = parser.parse_args(argv)
+
+    # Floats generados al vuelo: la entrada no cuenta en la memoria medida
+    valores = Flotantes(args.n)
+    millones = args.n / 1e6
+    print(f'{args.n:,} appends\n')
+    for nombre, funcion in CASOS.items():
+        segundos, pico = medir(funcion, valores)
+        print(f'{nombre:>24}: {segundos / millones:.3f} s/millón  pico {pico / 1024**2 / millones:7.1f} MB/millón')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Columna de texto codificada por diccionario: códigos enteros + tabla de categorías
+@author: Alex Ballera
+"""
+#%%
+import numpy as np
+
+# Mayor punto de código Unicode: todo texto que empieza con p es < p + _MAXIMO
+_MAXIMO = '\U0010FFFF'
+
+#%% ===========================================================================
+# Columna categórica
+# =============================================================================
+class ColumnaCategorica:
+    """Texto guardado como códigos enteros que apuntan a una tabla ordenada.
+
+    Los predicados de texto (prefijo, subcadena, igualdad) se evalúan una
+    sola vez sobre la tabla de categorías —que tiene tantas entradas como
+    valores distintos— y el resultado se lleva a las filas indexando por
+    código. Así nunca se compara texto fila por fila.
+    """
+    def __init__(self, codigos, categorias):
+        self.codigos = codigos
+        self.categorias = categorias
+
+    @classmethod
+    def desde_array(cls, valores):
+        categorias, codigos = np.unique(np.asarray(valores), return_inverse=True)
+        dtype = np.min_scalar_type(max(len(categorias) - 1, 0))
+        return cls(codigos.astype(dtype).reshape(-1), categorias)
+
+    def valores(self):
+        """Reconstruye el array de texto original."""
+        return self.categorias[self.codigos]
+
+    def __len__(self):
+        return self.codigos.size
+
+    @property
+    def nbytes(self):
+        return self.codigos.nbytes + self.categorias.nbytes
+
+    def _filas(self, tabla):
+        """Lleva una máscara sobre categorías a una máscara sobre filas."""
+        return tabla[self.codigos]
+
+    def _categorias(self, ignorar_mayusculas):
+        return np.char.lower(self.categorias) if ignorar_mayusculas else self.categorias
+
+    def igual(self, valor):
+        i = np.searchsorted(self.categorias, valor)
+        if i < len(self.categorias) and self.categorias[i] == valor:
+            return self.codigos == i
+        return np.zeros(len(self), dtype=bool)
+
+    def en(self, valores):
+        return self._filas(np.isin(self.categorias, list(valores)))
+
+    def prefijo(self, prefijo):
+        """Filas cuyo texto empieza con `prefijo`.
+
+        Con la tabla ordenada, las categorías que comparten prefijo forman
+        un tramo contiguo de códigos: basta con dos búsquedas binarias.
+        """
+        inicio, fin = np.searchsorted(self.categorias, [prefijo, prefijo + _MAXIMO])
+        return (self.codigos >= inicio) & (self.codigos < fin)
+
+    def contiene(self, subcadena, ignorar_mayusculas=False):
+        if ignorar_mayusculas:
+            subcadena = subcadena.lower()
+        return self._filas(np.char.find(self._categorias(ignorar_mayusculas), subcadena) >= 0)
+
+    def termina_con(self, sufijo, ignorar_mayusculas=False):
+        if ignorar_mayusculas:
+            sufijo = sufijo.lower()
+        return self._filas(np.char.endswith(self._categorias(ignorar_mayusculas), sufijo))
+
+    def __repr__(self):
+        return (f'ColumnaCategorica({len(self)} filas, {len(self.categorias)} categorías, '
+                f'códigos {self.codigos.dtype})')
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tabla columnar sobre un único buffer 2-D: apilar y separar sin copiar
+@author: Alex Ballera
+"""
+#%%
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+#%% ===========================================================================
+# Detección de columnas que ya viven en un mismo buffer
+# =============================================================================
+def _raiz(arr):
+    while isinstance(arr.base, np.ndarray):
+        arr = arr.base
+    return arr
+
+
+def _vista_sin_copia(columnas):
+    """Si las columnas son filas equiespaciadas de un mismo buffer, devuelve la vista 2-D.
+
+    Es el caso de columnas que salieron de `TablaColumnar.separar()` o de
+    las filas de un arreglo 2-D: se pueden volver a "apilar" gratis.
+    Devuelve (vista, None) o (None, motivo por el que hay que copiar).
+    """
+    primera = columnas[0]
+    if any(c.ndim != 1 for c in columnas):
+        return None, 'alguna columna no es 1-D'
+    if any(c.dtype != primera.dtype for c in columnas):
+        return None, 'las columnas tienen dtypes distintos'
+    if any(c.size != primera.size for c in columnas):
+        return None, 'las columnas tienen largos distintos'
+    if any(not c.flags.c_contiguous for c in columnas):
+        return None, 'alguna columna no es contigua en memoria'
+    if any(_raiz(c) is not _raiz(primera) or c.base is None for c in columnas):
+        return None, 'las columnas no comparten un mismo buffer'
+
+    direcciones = [c.__array_interface__['data'][0] for c in columnas]
+    paso = direcciones[1] - direcciones[0] if len(columnas) > 1 else primera.nbytes
+    if paso < primera.nbytes or paso % primera.itemsize:
+        return None, 'las columnas se solapan o no están alineadas'
+    if any(b - a != paso for a, b in zip(direcciones, direcciones[1:])):
+        return None, 'las columnas no están equiespaciadas en el buffer'
+
+    vista = as_strided(primera, shape=(len(columnas), primera.size), strides=(paso, primera.itemsize),
+                       writeable=primera.flags.writeable)
+    return vista, None
+
+#%% ===========================================================================
+# Tabla columnar
+# =============================================================================
+class TablaColumnar:
+    """Columnas del mismo largo guardadas como filas de un buffer (columnas, n) en orden C.
+
+    - `apilar(axis=0)` equivale a `np.stack(columnas, axis=0)` y es el buffer mismo.
+    - `apilar(axis=1)` equivale a `np.stack(columnas, axis=1)` y es su transpuesta (vista).
+    - `separar()` devuelve una vista 1-D por columna.
+    - `concatenar()` equivale a `np.concatenate(columnas)` y es una vista si
+      las columnas están una a continuación de la otra; si quedan huecos
+      entre ellas (columnas equiespaciadas pero no adyacentes) copia.
+
+    Cada vez que hay que copiar datos (al armar la tabla o al concatenar) se registra en
+    `copias` con el motivo, para saber dónde se pierde el "gratis".
+    """
+    def __init__(self, nombres, n, dtype=np.float64):
+        self.nombres = list(nombres)
+        self.buffer = np.empty((len(self.nombres), n), dtype=dtype)
+        self.copias = []
+
+    @classmethod
+    def desde_columnas(cls, dtype=None, **columnas):
+        """Arma la tabla reutilizando la memoria de las columnas cuando se puede."""
+        nombres = list(columnas)
+        arreglos = [np.asarray(c) for c in columnas.values()]
+        if not arreglos:
+            raise ValueError('se necesita al menos una columna')
+
+        vista, motivo = _vista_sin_copia(arreglos)
+        if vista is not None and (dtype is None or np.dtype(dtype) == vista.dtype):
+            tabla = cls.__new__(cls)
+            tabla.nombres, tabla.buffer, tabla.copias = nombres, vista, []
+            return tabla
+
+        if vista is not None:
+            motivo = f'se pidió dtype {np.dtype(dtype)} y las columnas son {vista.dtype}'
+        largos = {c.shape for c in arreglos}
+        if len(largos) != 1 or len(next(iter(largos))) != 1:
+            raise ValueError(f'las columnas deben ser 1-D y del mismo largo: {largos}')
+
+        tabla = cls(nombres, arreglos[0].size, dtype or np.result_type(*arreglos))
+        for nombre, valores in zip(nombres, arreglos):
+            tabla[nombre] = valores
+        tabla.copias = [(nombre, motivo) for nombre in nombres]
+        return tabla
+
+    def _fila(self, nombre):
+        try:
+            return self.nombres.index(nombre)
+        except ValueError:
+            raise KeyError(nombre) from None
+
+    def __getitem__(self, nombre):
+        return self.buffer[self._fila(nombre)]
+
+    def __setitem__(self, nombre, valores):
+        # Escribe dentro del buffer existente: no hay nueva asignación de memoria
+        np.copyto(self.buffer[self._fila(nombre)], valores, casting='same_kind')
+
+    def __len__(self):
+        return self.buffer.shape[1]
+
+    def apilar(self, axis=0):
+        if axis in (0, -2):
+            return self.buffer
+        if axis in (1, -1):
+            return self.buffer.T
+        raise ValueError(f'axis debe ser 0 o 1, no {axis}')
+
+    def separar(self):
+        return list(self.buffer)
+
+    def concatenar(self):
+        if not self.buffer.flags.c_contiguous:
+            # reshape(-1) de un buffer con huecos entre filas copia (cada vez que se llama)
+            copia = ('concatenar()', 'hay huecos entre las columnas del buffer: reshape(-1) tuvo que copiar')
+            if copia not in self.copias:
+                self.copias.append(copia)
+        return self.buffer.reshape(-1)
+
+    def reporte_copias(self):
+        if not self.copias:
+            return 'Sin copias: todas las columnas son vistas del buffer.'
+        return '\n'.join(f'Copia de "{nombre}": {motivo}' for nombre, motivo in self.copias)
+
+    def __repr__(self):
+        return f'TablaColumnar({self.nombres}, n={len(self)}, dtype={self.buffer.dtype})'
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Consultas por rango con índices ordenados (argsort + searchsorted)
+@author: Alex Ballera
+"""
+#%%
+from collections import OrderedDict
+
+import numpy as np
+
+#%% ===========================================================================
+# Selección: filas que cumplen un predicado
+# =============================================================================
+def _contenidos(buscados, ordenados):
+    """Máscara de qué elementos de `buscados` están en `ordenados` (ambos ordenados)."""
+    if ordenados.size == 0:
+        return np.zeros(buscados.size, dtype=bool)
+    pos = np.searchsorted(ordenados, buscados)
+    pos[pos == ordenados.size] = 0
+    return ordenados[pos] == buscados
+
+
+class Seleccion:
+    """Posiciones (ordenadas y sin repetir) de las filas que cumplen una consulta.
+
+    Se combinan con `&`, `|` y `~` operando sobre las posiciones, sin volver
+    a recorrer las columnas: AND busca la selección chica dentro de la
+    grande con `searchsorted`, OR fusiona dos secuencias ya ordenadas.
+    Las filas con NaN nunca cumplen un rango, así que `~` las incluye, igual
+    que `~(columna > x)` con máscaras booleanas.
+    """
+    def __init__(self, posiciones, n):
+        self.posiciones = posiciones
+        self.n = n
+
+    def __and__(self, otra):
+        chica, grande = sorted((self.posiciones, otra.posiciones), key=len)
+        return Seleccion(chica[_contenidos(chica, grande)], self.n)
+
+    def __or__(self, otra):
+        # sort estable = timsort: con dos tramos ya ordenados es una fusión lineal
+        todas = np.concatenate((self.posiciones, otra.posiciones))
+        todas.sort(kind='stable')
+        nuevas = np.ones(todas.size, dtype=bool)
+        nuevas[1:] = todas[1:] != todas[:-1]
+        return Seleccion(todas[nuevas], self.n)
+
+    def __invert__(self):
+        mascara = np.ones(self.n, dtype=bool)
+        mascara[self.posiciones] = False
+        return Seleccion(np.flatnonzero(mascara), self.n)
+
+    def __len__(self):
+        return self.posiciones.size
+
+    @property
+    def size(self):
+        return self.posiciones.size
+
+    def mascara(self):
+        """Máscara booleana equivalente, por ejemplo para usar con pandas."""
+        mascara = np.zeros(self.n, dtype=bool)
+        mascara[self.posiciones] = True
+        return mascara
+
+    def __repr__(self):
+        return f'Seleccion({self.size} de {self.n} filas)'
+
+#%% ===========================================================================
+# Consulta indexada sobre varias columnas paralelas
+# =============================================================================
+class ConsultaIndexada:
+    """Responde predicados de rango sobre columnas paralelas sin recorrerlas.
+
+    El índice de cada columna (argsort estable + valores ordenados) se
+    construye una sola vez, la primera vez que se consulta. Cada rango se
+    resuelve con dos `searchsorted` (O(log n)) más el orden de las k
+    posiciones encontradas, y se guarda en una caché LRU para que los
+    predicados repetidos sean gratis.
+
+    >>> q = ConsultaIndexada(pais=pais, altura=altura, peso=peso)
+    >>> q.filas('pais', q.mayor('altura', 1.80) & q.mayor('peso', 90))
+    """
+    def __init__(self, max_cache=1024, **columnas):
+        if not columnas:
+            raise ValueError('se necesita al menos una columna')
+        self.columnas = {nombre: np.asarray(valores) for nombre, valores in columnas.items()}
+        largos = {valores.shape for valores in self.columnas.values()}
+        if len(largos) != 1 or len(next(iter(largos))) != 1:
+            raise ValueError(f'las columnas deben ser 1-D y del mismo largo: {largos}')
+        self.n = next(iter(self.columnas.values())).size
+        self.max_cache = max_cache
+        self._indices = {}
+        self._cache = OrderedDict()
+
+    def _indice(self, columna):
+        """(orden, valores ordenados, cantidad de valores válidos) de la columna.
+
+        argsort deja los NaN (y NaT) al final: los rangos se cortan en
+        `validos` para que, como `columna > x`, nunca los incluyan.
+        """
+        if columna not in self._indices:
+            valores = self.columnas[columna]
+            orden = np.argsort(valores, kind='stable')
+            ordenados = valores[orden]
+            if valores.dtype.kind in 'fc':
+                validos = self.n - int(np.isnan(valores).sum())
+            elif valores.dtype.kind in 'mM':
+                validos = self.n - int(np.isnat(valores).sum())
+            else:
+                validos = self.n
+            self._indices[columna] = (orden, ordenados, validos)
+        return self._indices[columna]
+
+    def rango(self, columna, minimo=None, maximo=None, incluir_minimo=True, incluir_maximo=True):
+        """Filas con `minimo <(=) columna <(=) maximo`; `None` deja el extremo abierto."""
+        clave = (columna, minimo, maximo, incluir_minimo, incluir_maximo)
+        if clave in self._cache:
+            self._cache.move_to_end(clave)
+            return self._cache[clave]
+
+        orden, ordenados, validos = self._indice(columna)
+        inicio = 0 if minimo is None else np.searchsorted(
+            ordenados[:validos], minimo, side='left' if incluir_minimo else 'right')
+        fin = validos if maximo is None else np.searchsorted(
+            ordenados[:validos], maximo, side='right' if incluir_maximo else 'left')
+        seleccion = Seleccion(np.sort(orden[inicio:max(inicio, fin)]), self.n)
+
+        self._cache[clave] = seleccion
+        if len(self._cache) > self.max_cache:
+            self._cache.popitem(last=False)
+        return seleccion
+
+    def mayor(self, columna, valor):
+        return self.rango(columna, minimo=valor, incluir_minimo=False)
+
+    def mayor_igual(self, columna, valor):
+        return self.rango(columna, minimo=valor)
+
+    def menor(self, columna, valor):
+        return self.rango(columna, maximo=valor, incluir_maximo=False)
+
+    def menor_igual(self, columna, valor):
+        return self.rango(columna, maximo=valor)
+
+    def igual(self, columna, valor):
+        return self.rango(columna, minimo=valor, maximo=valor)
+
+    def filas(self, columna, seleccion):
+        """Valores de `columna` en las filas seleccionadas (en el orden original)."""
+        return self.columnas[columna][seleccion.posiciones]
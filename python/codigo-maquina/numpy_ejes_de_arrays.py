@@ -19,4 +19,17 @@ print(f'\nPos Mínimo: {altura_y_pesos.argmin(axis=0)}')
 print(f'\nPos Máximo: {altura_y_pesos.argmax(axis=0)}')
 print(f'\nPromedio: {altura_y_pesos.mean(axis=0)}')
 print(f'\nSuma: {altura_y_pesos.sum(axis=0)}')
+#%% Todas las estadísticas de un eje leyendo el arreglo una sola vez
+from numpy_reducciones import describir_eje
+
+resumen = describir_eje(altura_y_pesos, axis=0)
+print(f'\nMínimo: {resumen.minimo}  Máximo: {resumen.maximo}')
+print(f'Pos Mínimo: {resumen.pos_minimo}  Pos Máximo: {resumen.pos_maximo}')
+print(f'Promedio: {resumen.promedio}  Suma: {resumen.suma}')
+print(f'Varianza: {resumen.varianza()}  NaN: {resumen.n_nan}')
+
+# Los resúmenes parciales (por bloques o por procesos) se combinan sin releer datos
+parte1 = describir_eje(altura_y_pesos[:2], axis=0)
+parte2 = describir_eje(altura_y_pesos[2:], axis=0)
+print(f'Combinado: {parte1.combinar(parte2).promedio}')
 # %%
@@ -81,4 +81,37 @@ print(f'\npais[peso > 90]: \n{pais[peso > 90]}, {pais[peso > 90].size}')
 print(f'\npais[altura > 1.80]: \n{pais[altura > 1.80]}, {pais[altura > 1.80].size}')
 print(f'\npais[(altura > 1.80) & (peso > 90)]: \n{pais[(altura > 1.80) & (peso > 90)]}, {pais[(altura > 1.80) & (peso > 90)].size}')
 print(f'\npais[(altura > 1.80) | (peso > 90)]: \n{pais[(altura > 1.80) | (peso > 90)]}, {pais[(altura > 1.80) | (peso > 90)].size}')
+#%% Consultas indexadas: cada índice se ordena una vez y los predicados se reutilizan
+from numpy_consultas_indexadas import ConsultaIndexada
+
+consulta = ConsultaIndexada(pais=pais, altura=altura, peso=peso)
+altos = consulta.mayor('altura', 1.80)
+pesados = consulta.mayor('peso', 90)
+
+print(f'\naltos & pesados: \n{consulta.filas("pais", altos & pesados)}, {(altos & pesados).size}')
+print(f'\naltos | pesados: \n{consulta.filas("pais", altos | pesados)}, {(altos | pesados).size}')
+print(np.array_equal(consulta.filas('pais', altos & pesados), pais[(altura > 1.80) & (peso > 90)]))
+print(np.array_equal(consulta.filas('pais', altos | pesados), pais[(altura > 1.80) | (peso > 90)]))
+#%% Máscaras empaquetadas en bits: 8 veces menos memoria y caché por presupuesto
+from numpy_mascaras_compactas import CacheMascaras
+
+cache = CacheMascaras(presupuesto_bytes=1024)
+altos_bits = cache.obtener(('altura', '>', 1.80), lambda: altura > 1.80)
+pesados_bits = cache.obtener(('peso', '>', 90), lambda: peso > 90)
+
+print(altos_bits, (altura > 1.80).nbytes)
+print(np.array_equal(pais[(altos_bits & pesados_bits).a_booleana()], pais[(altura > 1.80) & (peso > 90)]))
+print(np.array_equal((~altos_bits | pesados_bits).a_booleana(), ~(altura > 1.80) | (peso > 90)))
+cache.obtener(('altura', '>', 1.80), lambda: altura > 1.80)
+print(cache)
+#%% País codificado por diccionario: filtros de texto sobre la tabla de categorías
+from numpy_categorias_texto import ColumnaCategorica
+
+paises = ColumnaCategorica.desde_array(pais)
+print(paises, pais.nbytes, paises.nbytes)
+
+print(f'\nempiezan con "Co": {pais[paises.prefijo("Co")]}')
+print(f'\ncontienen "guinea": {pais[paises.contiene("guinea", ignorar_mayusculas=True)]}')
+print(f'\nempiezan con "S" y altura > 1.75: {pais[paises.prefijo("S") & (altura > 1.75)]}')
+print(np.array_equal(paises.prefijo('Co'), np.char.startswith(pais, 'Co')))
 # %%
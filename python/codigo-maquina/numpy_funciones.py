@@ -50,4 +50,16 @@ def imc(peso, altura):
 
 imc = np.frompyfunc(imc, 2, 1) # type: ignore # 2 parámetros 1 elemento de salida
 
-print(imc(peso, altura))
\ No newline at end of file
+print(imc(peso, altura))
+#%% Versión tipada: mismo resultado, pero float64 en lugar de object
+from numpy_imc import imc as imc_tipado
+
+imc_rapido = imc_tipado(peso, altura)
+print(imc_rapido.dtype, imc(peso, altura).dtype)
+np.testing.assert_allclose(imc_rapido, imc(peso, altura).astype(np.float64), rtol=1e-12)
+
+# where= salta alturas inválidas (quedan en NaN) y out= reutiliza el buffer
+altura_con_ceros = altura.copy()
+altura_con_ceros[:3] = 0
+print(imc_tipado(peso, altura_con_ceros, where=altura_con_ceros > 0)[:5])
+imc_tipado(peso, altura, out=imc_rapido)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cálculo de IMC con NumPy: kernel tipado y procesamiento por bloques (streaming)
+@author: Alex Ballera
+"""
+#%%
+from dataclasses import dataclass
+
+import numpy as np
+
+#%% ===========================================================================
+# Resumen acumulado
+# =============================================================================
+@dataclass
+class ResumenIMC:
+    """Estadísticas acumuladas del IMC: cantidad, suma, mínimo y máximo.
+
+    Se pueden combinar resúmenes parciales (de archivos o procesos
+    distintos) con `combinar` sin volver a leer los datos. Las filas cuyo
+    IMC no es un número finito (peso o altura NaN, altura 0) no entran en
+    ninguna estadística y se cuentan en `n_invalidos`.
+    """
+    n: int = 0
+    suma: float = 0.0
+    minimo: float = np.inf
+    maximo: float = -np.inf
+    n_invalidos: int = 0
+
+    @property
+    def media(self):
+        return self.suma / self.n if self.n else np.nan
+
+    def combinar(self, otro):
+        return ResumenIMC(self.n + otro.n,
+                          self.suma + otro.suma,
+                          min(self.minimo, otro.minimo),
+                          max(self.maximo, otro.maximo),
+                          self.n_invalidos + otro.n_invalidos)
+
+#%% ===========================================================================
+# Kernel tipado
+# =============================================================================
+def imc(peso, altura, out=None, where=True, dtype=None):
+    """IMC = peso / altura² como ufuncs tipadas (reemplazo de `np.frompyfunc`).
+
+    Devuelve un array `float32`/`float64` en lugar de `object` y acepta
+    broadcasting, `out=` para reutilizar un buffer y `where=` para saltar
+    posiciones (por ejemplo `where=altura > 0`). Las posiciones saltadas
+    quedan en NaN cuando el resultado se crea aquí; con `out=` conservan
+    el valor que ya tenía el buffer, igual que en las ufuncs de NumPy.
+
+    Si no se indica `dtype` se usa el de `out`, o el tipo flotante que
+    NumPy promueve a partir de las entradas (f4 con f4 da f4, i4 da f8).
+    """
+    peso = np.asarray(peso)
+    altura = np.asarray(altura)
+    if dtype is None:
+        dtype = out.dtype if out is not None else np.result_type(peso, altura, np.float32)
+    dtype = np.dtype(dtype)
+    if dtype.kind != 'f':
+        raise TypeError(f'el IMC necesita un dtype flotante, no {dtype}')
+
+    if out is None:
+        forma = np.broadcast_shapes(peso.shape, altura.shape, np.shape(where))
+        out = np.full(forma, np.nan, dtype=dtype)
+
+    np.multiply(altura, altura, out=out, where=where, dtype=dtype)   # altura²
+    np.divide(peso, out, out=out, where=where, dtype=dtype)          # peso / altura²
+    return out
+
+#%% ===========================================================================
+# Motor por bloques
+# =============================================================================
+def imc_por_bloques(bloques, tamano_bloque=65_536, dtype=np.float64):
+    """Calcula media, mínimo y máximo del IMC sobre un iterable de bloques.
+
+    `bloques` es cualquier iterable de pares (peso, altura) con arrays del
+    mismo largo. Cada bloque se recorre en trozos de `tamano_bloque`
+    filas usando un único buffer preasignado: las ufuncs escriben con
+    `out=` y no se crean arrays temporales, así la memoria se mantiene
+    constante sin importar el tamaño total de la entrada.
+
+    Los huecos de un CSV o Parquet (NaN) y las alturas 0 dan un IMC no
+    finito: esas filas se saltan con `where=` en las tres reducciones, así
+    media, mínimo y máximo salen siempre de las mismas filas.
+    """
+    buffer = np.empty(tamano_bloque, dtype=dtype)
+    validos = np.empty(tamano_bloque, dtype=bool)
+    resumen = ResumenIMC()
+
+    for peso, altura in bloques:
+        peso = np.asarray(peso)
+        altura = np.asarray(altura)
+        if peso.shape != altura.shape:
+            raise ValueError(f'peso {peso.shape} y altura {altura.shape} deben tener la misma forma')
+
+        peso = peso.reshape(-1)
+        altura = altura.reshape(-1)
+        for inicio in range(0, peso.size, tamano_bloque):
+            p = peso[inicio:inicio + tamano_bloque]
+            a = altura[inicio:inicio + tamano_bloque]
+            with np.errstate(divide='ignore', invalid='ignore'):   # altura 0: se salta abajo
+                resultado = imc(p, a, out=buffer[:p.size])          # buffer[:m] es vista, no copia
+            mascara = np.isfinite(resultado, out=validos[:p.size])
+
+            n = int(np.count_nonzero(mascara))
+            resumen.n += n
+            resumen.n_invalidos += resultado.size - n
+            resumen.suma += float(np.add.reduce(resultado, dtype=np.float64, where=mascara))
+            resumen.minimo = min(resumen.minimo, float(np.minimum.reduce(resultado, where=mascara, initial=np.inf)))
+            resumen.maximo = max(resumen.maximo, float(np.maximum.reduce(resultado, where=mascara, initial=-np.inf)))
+
+    return resumen
+
+#%% ===========================================================================
+# Fuentes de bloques
+# =============================================================================
+def bloques_de_arrays(peso, altura, tamano_bloque=65_536):
+    """Divide dos arrays en memoria en bloques (vistas, sin copiar)."""
+    for inicio in range(0, len(peso), tamano_bloque):
+        yield peso[inicio:inicio + tamano_bloque], altura[inicio:inicio + tamano_bloque]
+
+
+def bloques_csv(ruta, columna_peso='peso', columna_altura='altura', filas_por_bloque=1_000_000, **opciones):
+    """Lee un CSV por partes con pandas y entrega bloques (peso, altura)."""
+    import pandas as pd
+
+    with pd.read_csv(ruta, usecols=[columna_peso, columna_altura],
+                     chunksize=filas_por_bloque, **opciones) as lector:
+        for parte in lector:
+            yield parte[columna_peso].to_numpy(), parte[columna_altura].to_numpy()
+
+
+def bloques_parquet(ruta, columna_peso='peso', columna_altura='altura', filas_por_bloque=1_000_000):
+    """Lee un Parquet por lotes (requiere pyarrow) y entrega bloques (peso, altura)."""
+    import pyarrow.parquet as pq
+
+    archivo = pq.ParquetFile(ruta)
+    for lote in archivo.iter_batches(batch_size=filas_por_bloque, columns=[columna_peso, columna_altura]):
+        yield (lote.column(columna_peso).to_numpy(zero_copy_only=False),
+               lote.column(columna_altura).to_numpy(zero_copy_only=False))
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de las implementaciones de IMC: bucle, vectorizada, frompyfunc y tipada
+@author: Alex Ballera
+
+Uso:
+    python numpy_imc_benchmark.py                       # tamaños 1e2..1e8
+    python numpy_imc_benchmark.py --tamanos 100 10000 --dtypes f8
+    python numpy_imc_benchmark.py --max-lento 1000000   # tope para bucle/frompyfunc
+
+Cada caso corre en un proceso nuevo para que el pico de RSS sea propio del
+caso. Los resultados se agregan a un historial JSON (una corrida por
+entrada) para comparar versiones del kernel entre commits.
+"""
+#%%
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+from numpy_imc import imc as imc_tipado
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+HISTORIAL = Path(__file__).with_name('numpy_imc_benchmark.json')
+
+#%% ===========================================================================
+# Implementaciones (las mismas de numpy_base.py, numpy_funciones.py y numpy_imc.py)
+# =============================================================================
+def imc_vectorizado(pesos, alturas):
+    return pesos/(alturas*alturas)
+
+
+def imc_bucle(pesos, alturas):
+    imc_for = []
+    for i in range(alturas.size):
+        imc_for.append(pesos[i]/(alturas[i]*alturas[i]))
+    return imc_for
+
+
+def _imc(peso, altura):
+    return peso / (altura*altura)
+
+imc_frompyfunc = np.frompyfunc(_imc, 2, 1)
+
+IMPLEMENTACIONES = {
+    'vectorizado': imc_vectorizado,
+    'bucle': imc_bucle,
+    'frompyfunc': imc_frompyfunc,
+    'tipado': imc_tipado,
+}
+LENTAS = {'bucle', 'frompyfunc'}
+
+#%% ===========================================================================
+# Datos y medición
+# =============================================================================
+def generar_datos(n, dtype):
+    """Alturas y pesos aleatorios; en dtypes enteros se usan cm y kg."""
+    rng = np.random.default_rng(42)
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'i':
+        alturas = rng.integers(150, 200, n).astype(dtype)
+        pesos = rng.integers(50, 110, n).astype(dtype)
+    else:
+        alturas = rng.uniform(1.50, 2.00, n).astype(dtype)
+        pesos = rng.uniform(50, 110, n).astype(dtype)
+    return pesos, alturas
+
+
+def _rss_pico_mb():
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KiB, macOS bytes
+    return pico / 1024**2 if sys.platform == 'darwin' else pico / 1024
+
+
+def medir_caso(implementacion, n, dtype, repeticiones=3):
+    """Mide un caso. Pensado para correr en un proceso hijo recién creado."""
+    funcion = IMPLEMENTACIONES[implementacion]
+    pesos, alturas = generar_datos(n, dtype)
+    rss_base = _rss_pico_mb()
+
+    # En i2 altura*altura desborda; aquí solo interesa el costo
+    warnings.simplefilter('ignore', RuntimeWarning)
+    with np.errstate(all='ignore'):
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            resultado = funcion(pesos, alturas)
+            tiempos.append(time.perf_counter() - inicio)
+            del resultado
+        rss_pico = _rss_pico_mb()
+
+        # Asignaciones: bloques de Python vivos que deja el resultado y pico
+        # de memoria rastreada (NumPy registra sus buffers en tracemalloc)
+        bloques_antes = sys.getallocatedblocks()
+        tracemalloc.start()
+        resultado = funcion(pesos, alturas)
+        _, traza_pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        bloques_python = sys.getallocatedblocks() - bloques_antes
+        del resultado
+
+    mejor = min(tiempos)
+    return {
+        'implementacion': implementacion,
+        'n': n,
+        'dtype': np.dtype(dtype).str,
+        'segundos': mejor,
+        'filas_por_segundo': n / mejor if mejor else None,
+        'rss_base_mb': rss_base,
+        'rss_pico_mb': rss_pico,
+        'memoria_traza_pico_mb': traza_pico / 1024**2,
+        'bloques_python': bloques_python,
+    }
+
+#%% ===========================================================================
+# Ejecución e historial
+# =============================================================================
+def _commit_actual():
+    try:
+        salida = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=Path(__file__).parent, check=True)
+        return salida.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def correr(tamanos, dtypes, implementaciones, max_lento, repeticiones):
+    casos = []
+    contexto = get_context('spawn')
+    for n in tamanos:
+        for dtype in dtypes:
+            for implementacion in implementaciones:
+                if implementacion in LENTAS and n > max_lento:
+                    continue
+                with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as proceso:
+                    caso = proceso.submit(medir_caso, implementacion, n, dtype, repeticiones).result()
+                rss = f"{caso['rss_pico_mb']:.1f}MB" if caso['rss_pico_mb'] is not None else '-'
+                print(f"{implementacion:>12} n={n:>11,} {caso['dtype']:>4} "
+                      f"{caso['segundos']:.6f}s {caso['filas_por_segundo']:>14,.0f} filas/s "
+                      f"rss={rss} bloques={caso['bloques_python']}")
+                casos.append(caso)
+    return casos
+
+
+def guardar_historial(casos, ruta=HISTORIAL):
+    historial = json.loads(ruta.read_text()) if ruta.exists() else []
+    historial.append({
+        'fecha': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _commit_actual(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'maquina': platform.platform(),
+        'casos': casos,
+    })
+    ruta.write_text(json.dumps(historial, indent=2, ensure_ascii=False))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanos', type=lambda x: int(float(x)), nargs='+',
+                        default=[10**k for k in range(2, 9)])
+    parser.add_argument('--dtypes', nargs='+', default=['i2', 'i4', 'f4', 'f8'])
+    parser.add_argument('--implementaciones', nargs='+', default=list(IMPLEMENTACIONES),
+                        choices=list(IMPLEMENTACIONES))
+    parser.add_argument('--max-lento', type=lambda x: int(float(x)), default=10**6,
+                        help='n máximo para las implementaciones que iteran en Python')
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--historial', type=Path, default=HISTORIAL)
+    args = parser.parse_args(argv)
+
+    casos = correr(args.tamanos, args.dtypes, args.implementaciones, args.max_lento, args.repeticiones)
+    guardar_historial(casos, args.historial)
+    print(f'\nHistorial actualizado: {args.historial}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Máscaras booleanas empaquetadas en bits (np.packbits) y caché LRU por bytes
+@author: Alex Ballera
+"""
+#%%
+from collections import OrderedDict
+
+import numpy as np
+
+# Cantidad de bits en 1 de cada byte posible (popcount por tabla)
+_BITS_POR_BYTE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+#%% ===========================================================================
+# Máscara empaquetada: 1 bit por fila en lugar de 1 byte
+# =============================================================================
+class MascaraCompacta:
+    """Máscara booleana de `n` filas guardada en `ceil(n / 8)` bytes.
+
+    `&`, `|`, `^` y `~` trabajan byte a byte sobre la forma empaquetada,
+    sin desempaquetar. Los bits de relleno del último byte se mantienen
+    en 0 para que `contar()` y `~` sean correctos.
+    """
+    def __init__(self, bits, n):
+        self.bits = bits
+        self.n = n
+
+    @classmethod
+    def desde_booleana(cls, mascara):
+        mascara = np.asarray(mascara, dtype=bool)
+        return cls(np.packbits(mascara), mascara.size)
+
+    @classmethod
+    def desde_posiciones(cls, posiciones, n):
+        mascara = np.zeros(n, dtype=bool)
+        mascara[posiciones] = True
+        return cls.desde_booleana(mascara)
+
+    def _validar(self, otra):
+        if self.n != otra.n:
+            raise ValueError(f'las máscaras tienen largos distintos: {self.n} y {otra.n}')
+
+    def __and__(self, otra):
+        self._validar(otra)
+        return MascaraCompacta(np.bitwise_and(self.bits, otra.bits), self.n)
+
+    def __or__(self, otra):
+        self._validar(otra)
+        return MascaraCompacta(np.bitwise_or(self.bits, otra.bits), self.n)
+
+    def __xor__(self, otra):
+        self._validar(otra)
+        return MascaraCompacta(np.bitwise_xor(self.bits, otra.bits), self.n)
+
+    def __invert__(self):
+        bits = np.invert(self.bits)
+        sobrantes = self.n % 8
+        if sobrantes:
+            bits[-1] &= (0xFF << (8 - sobrantes)) & 0xFF   # limpia el relleno
+        return MascaraCompacta(bits, self.n)
+
+    def contar(self):
+        """Cantidad de filas en True."""
+        return int(_BITS_POR_BYTE[self.bits].sum())
+
+    def a_booleana(self):
+        return np.unpackbits(self.bits, count=self.n).view(bool)
+
+    def posiciones(self):
+        return np.flatnonzero(self.a_booleana())
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+    def __len__(self):
+        return self.n
+
+    def __repr__(self):
+        return f'MascaraCompacta({self.contar()} de {self.n} filas, {self.nbytes:,} bytes)'
+
+#%% ===========================================================================
+# Caché de máscaras con presupuesto en bytes
+# =============================================================================
+class CacheMascaras:
+    """Caché LRU de predicados ya evaluados, limitada por bytes en lugar de entradas.
+
+    >>> cache = CacheMascaras(presupuesto_bytes=64 * 1024**2)
+    >>> altos = cache.obtener(('altura', '>', 1.80), lambda: altura > 1.80)
+    """
+    def __init__(self, presupuesto_bytes):
+        self.presupuesto_bytes = presupuesto_bytes
+        self.bytes_usados = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self._mascaras = OrderedDict()
+
+    def obtener(self, clave, calcular):
+        """Devuelve la máscara de `clave`; si no está, la calcula con `calcular()`."""
+        if clave in self._mascaras:
+            self.aciertos += 1
+            self._mascaras.move_to_end(clave)
+            return self._mascaras[clave]
+
+        self.fallos += 1
+        mascara = calcular()
+        if not isinstance(mascara, MascaraCompacta):
+            mascara = MascaraCompacta.desde_booleana(mascara)
+        self.guardar(clave, mascara)
+        return mascara
+
+    def guardar(self, clave, mascara):
+        if clave in self._mascaras:
+            self.bytes_usados -= self._mascaras.pop(clave).nbytes
+        if mascara.nbytes > self.presupuesto_bytes:
+            return   # no entra ni sola: se devuelve sin guardar
+        self._mascaras[clave] = mascara
+        self.bytes_usados += mascara.nbytes
+        while self.bytes_usados > self.presupuesto_bytes:
+            _, expulsada = self._mascaras.popitem(last=False)
+            self.bytes_usados -= expulsada.nbytes
+
+    def __contains__(self, clave):
+        return clave in self._mascaras
+
+    def __len__(self):
+        return len(self._mascaras)
+
+    def __repr__(self):
+        return (f'CacheMascaras({len(self)} máscaras, {self.bytes_usados:,}/{self.presupuesto_bytes:,} bytes, '
+                f'aciertos={self.aciertos}, fallos={self.fallos})')
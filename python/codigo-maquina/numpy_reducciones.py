@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reducciones por eje en una sola pasada (y en paralelo): mínimo, máximo, posiciones, suma, promedio y varianza
+@author: Alex Ballera
+"""
+#%%
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from functools import reduce
+
+import numpy as np
+
+#%% ===========================================================================
+# Resumen de un eje
+# =============================================================================
+@dataclass
+class ResumenEje:
+    """Estadísticas de un eje calculadas por bloques y combinables entre sí.
+
+    Los NaN se ignoran (como en `np.nanmin`, `np.nanmean`, ...) y se cuentan
+    en `n_nan`. Si una posición no tiene ningún valor válido, `minimo`,
+    `maximo` y `promedio` quedan en NaN y las posiciones en -1.
+    """
+    n: np.ndarray            # valores válidos
+    n_nan: np.ndarray
+    suma: np.ndarray
+    promedio: np.ndarray
+    m2: np.ndarray           # suma de cuadrados de las desviaciones (Welford)
+    minimo: np.ndarray
+    maximo: np.ndarray
+    pos_minimo: np.ndarray
+    pos_maximo: np.ndarray
+
+    def varianza(self, ddof=0):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.n > ddof, self.m2 / (self.n - ddof), np.nan)
+
+    def desvio(self, ddof=0):
+        return np.sqrt(self.varianza(ddof))
+
+    def combinar(self, otro):
+        """Une dos resúmenes de bloques consecutivos del eje reducido.
+
+        Promedio y m2 se combinan con la fórmula de Chan et al., que es
+        estable numéricamente. Ante empates gana `self` (el bloque anterior),
+        igual que `argmin`/`argmax`, que devuelven la primera aparición.
+        """
+        n = self.n + otro.n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = otro.promedio - self.promedio
+            promedio = np.where(otro.n == 0, self.promedio,
+                                np.where(self.n == 0, otro.promedio, self.promedio + delta * otro.n / n))
+            m2 = np.where((self.n == 0) | (otro.n == 0), self.m2 + otro.m2,
+                          self.m2 + otro.m2 + delta * delta * self.n * otro.n / n)
+
+        usar_min = (otro.n > 0) & ((self.n == 0) | (otro.minimo < self.minimo))
+        usar_max = (otro.n > 0) & ((self.n == 0) | (otro.maximo > self.maximo))
+        return ResumenEje(
+            n=n,
+            n_nan=self.n_nan + otro.n_nan,
+            suma=self.suma + otro.suma,
+            promedio=promedio,
+            m2=m2,
+            minimo=np.where(usar_min, otro.minimo, self.minimo),
+            maximo=np.where(usar_max, otro.maximo, self.maximo),
+            pos_minimo=np.where(usar_min, otro.pos_minimo, self.pos_minimo),
+            pos_maximo=np.where(usar_max, otro.pos_maximo, self.pos_maximo),
+        )
+
+    @classmethod
+    def concatenar(cls, resumenes):
+        """Une resúmenes de bloques del eje NO reducido (uno a continuación del otro)."""
+        return cls(**{campo.name: np.concatenate([getattr(r, campo.name) for r in resumenes])
+                      for campo in fields(cls)})
+
+    def a_dict(self, ddof=0):
+        resultado = {campo.name: getattr(self, campo.name) for campo in fields(self) if campo.name != 'm2'}
+        resultado['varianza'] = self.varianza(ddof)
+        return resultado
+
+#%% ===========================================================================
+# Resumen de un bloque
+# =============================================================================
+def resumir_bloque(bloque, eje=0, desplazamiento=0):
+    """Resume `bloque` a lo largo de `eje`.
+
+    Todo se calcula sobre el mismo bloque mientras está en memoria (y en
+    caché), así el arreglo completo se lee una sola vez aunque sea un
+    `np.memmap` más grande que la RAM. `desplazamiento` se suma a las
+    posiciones de mínimo y máximo cuando el bloque no empieza en 0.
+    """
+    bloque = np.asarray(bloque)
+    if bloque.dtype.kind == 'f':
+        es_nan = np.isnan(bloque)
+        n_nan = es_nan.sum(axis=eje)
+        para_min = np.where(es_nan, np.inf, bloque)
+        para_max = np.where(es_nan, -np.inf, bloque)
+        sin_nan = np.where(es_nan, 0, bloque)
+    else:
+        es_nan = None
+        n_nan = np.zeros(np.delete(bloque.shape, eje), dtype=np.intp)
+        para_min = para_max = sin_nan = bloque
+
+    n = bloque.shape[eje] - n_nan
+    suma = sin_nan.sum(axis=eje, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        promedio = suma / n
+
+    desvio = sin_nan - np.expand_dims(promedio, eje)
+    if es_nan is not None:
+        desvio[es_nan] = 0
+    m2 = (desvio * desvio).sum(axis=eje)
+
+    pos_minimo = para_min.argmin(axis=eje)
+    pos_maximo = para_max.argmax(axis=eje)
+    minimo = np.take_along_axis(para_min, np.expand_dims(pos_minimo, eje), eje).squeeze(eje)
+    maximo = np.take_along_axis(para_max, np.expand_dims(pos_maximo, eje), eje).squeeze(eje)
+
+    vacios = n == 0
+    if vacios.any():
+        minimo = np.where(vacios, np.nan, minimo)
+        maximo = np.where(vacios, np.nan, maximo)
+    return ResumenEje(n, n_nan, suma, promedio, m2, minimo, maximo,
+                      np.where(vacios, -1, pos_minimo + desplazamiento),
+                      np.where(vacios, -1, pos_maximo + desplazamiento))
+
+#%% ===========================================================================
+# API
+# =============================================================================
+def bloques_de_filas(n_filas, filas_por_bloque):
+    for inicio in range(0, n_filas, filas_por_bloque):
+        yield inicio, min(inicio + filas_por_bloque, n_filas)
+
+
+def describir_eje(arr, axis=0, filas_por_bloque=1 << 16):
+    """min, max, argmin, argmax, suma, promedio, varianza y cantidad de NaN de un eje.
+
+    El arreglo se recorre en bloques de filas (eje 0, el contiguo en orden
+    C y el que conviene para `np.memmap`):
+
+    - `axis=0`: cada bloque da un resumen parcial y se combinan con
+      `ResumenEje.combinar`.
+    - otro eje: cada bloque se reduce completo y los resultados se
+      concatenan.
+
+    >>> describir_eje(altura_y_pesos, axis=0).minimo      # == altura_y_pesos.min(axis=0)
+    """
+    arr = arr if isinstance(arr, np.ndarray) else np.asarray(arr)
+    axis = axis % arr.ndim
+    if arr.shape[0] == 0:
+        raise ValueError('no se puede describir un arreglo vacío')
+
+    if axis == 0:
+        resumen = None
+        for inicio, fin in bloques_de_filas(arr.shape[0], filas_por_bloque):
+            parcial = resumir_bloque(arr[inicio:fin], 0, inicio)
+            resumen = parcial if resumen is None else resumen.combinar(parcial)
+        return resumen
+
+    return ResumenEje.concatenar([resumir_bloque(arr[inicio:fin], axis)
+                                  for inicio, fin in bloques_de_filas(arr.shape[0], filas_por_bloque)])
+
+
+def describir_eje_paralelo(arr, axis=0, hilos=None, filas_por_bloque=1 << 16):
+    """Igual que `describir_eje`, repartiendo los bloques de filas entre hilos.
+
+    NumPy libera el GIL dentro de sus kernels numéricos, así que un
+    `ThreadPoolExecutor` alcanza para usar varios núcleos sin copiar datos
+    entre procesos (los hilos comparten el arreglo o el `np.memmap`). Los
+    resúmenes parciales se combinan en el orden de las filas, por eso las
+    posiciones de mínimo y máximo son las mismas que en la versión secuencial.
+    """
+    arr = arr if isinstance(arr, np.ndarray) else np.asarray(arr)
+    axis = axis % arr.ndim
+    n_filas = arr.shape[0]
+    if n_filas == 0:
+        raise ValueError('no se puede describir un arreglo vacío')
+    hilos = hilos or os.cpu_count() or 1
+    # Al menos un bloque por hilo
+    filas_por_bloque = max(1, min(filas_por_bloque, -(-n_filas // hilos)))
+
+    def resumir(limites):
+        inicio, fin = limites
+        if axis == 0:
+            return resumir_bloque(arr[inicio:fin], 0, inicio)
+        return resumir_bloque(arr[inicio:fin], axis)
+
+    with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+        parciales = list(ejecutor.map(resumir, bloques_de_filas(n_filas, filas_por_bloque)))
+
+    if axis == 0:
+        return reduce(ResumenEje.combinar, parciales)
+    return ResumenEje.concatenar(parciales)
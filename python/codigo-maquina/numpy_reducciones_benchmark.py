@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de escalado de describir_eje_paralelo con 1..N hilos
+@author: Alex Ballera
+
+Uso:
+    python numpy_reducciones_benchmark.py                  # 10 millones de filas (n, 2)
+    python numpy_reducciones_benchmark.py --filas 5e7 --hilos 1 2 4 8
+"""
+#%%
+import argparse
+import os
+import time
+
+import numpy as np
+
+from numpy_reducciones import describir_eje, describir_eje_paralelo
+
+#%%
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def seis_pasadas(altura_y_pesos):
+    """La versión de numpy_ejes_de_arrays.py: una pasada por estadística."""
+    return (altura_y_pesos.min(axis=0), altura_y_pesos.max(axis=0),
+            altura_y_pesos.argmin(axis=0), altura_y_pesos.argmax(axis=0),
+            altura_y_pesos.mean(axis=0), altura_y_pesos.sum(axis=0))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=lambda x: int(float(x)), default=10_000_000)
+    nucleos = os.cpu_count() or 1
+    parser.add_argument('--hilos', type=int, nargs='+',
+                        default=sorted({h for h in (1, 2, 4, 8, 16, 32) if h <= nucleos} | {nucleos}))
+    parser.add_argument('--filas-por-bloque', type=lambda x: int(float(x)), default=1 << 16)
+    parser.add_argument('--repeticiones', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(42)
+    altura_y_pesos = np.column_stack((rng.uniform(1.5, 2.0, args.filas), rng.uniform(50, 110, args.filas)))
+    print(f'{args.filas:,} filas, {altura_y_pesos.nbytes / 1024**2:,.0f} MB, {os.cpu_count()} núcleos\n')
+
+    base = medir(lambda: seis_pasadas(altura_y_pesos), args.repeticiones)
+    print(f'{"6 pasadas numpy":>22}: {base:.3f}s')
+    secuencial = medir(lambda: describir_eje(altura_y_pesos, 0, args.filas_por_bloque), args.repeticiones)
+    print(f'{"describir_eje":>22}: {secuencial:.3f}s')
+
+    for hilos in args.hilos:
+        tiempo = medir(lambda: describir_eje_paralelo(altura_y_pesos, 0, hilos, args.filas_por_bloque),
+                       args.repeticiones)
+        print(f'{f"paralelo {hilos} hilo(s)":>22}: {tiempo:.3f}s  aceleración x{secuencial / tiempo:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -25,4 +25,19 @@ print(union2, type(union2))
 print()
 separados2 = np.split(union2, 5)
 print(separados2, type(separados2))
+#%% Tabla columnar: las columnas viven en un buffer 2-D desde el principio
+from numpy_columnas import TablaColumnar
+
+tabla = TablaColumnar.desde_columnas(altura=altura, peso=peso) # única copia: altura y peso son arrays sueltos
+print(tabla.reporte_copias())
+
+union3 = tabla.apilar(axis=0)        # == np.stack((altura, peso), axis=0), sin copiar
+union4 = tabla.apilar(axis=1)        # == np.stack((altura, peso), axis=1), vista transpuesta
+altura3, peso3 = tabla.separar()     # vistas 1-D de cada fila del buffer
+print(np.array_equal(union3, union), np.array_equal(union4, union2))
+print(np.shares_memory(union3, altura3), np.shares_memory(union4, peso3))
+
+# Volver a apilar columnas que ya salieron de la tabla tampoco copia
+tabla2 = TablaColumnar.desde_columnas(altura=altura3, peso=peso3)
+print(tabla2.reporte_copias(), np.shares_memory(tabla2.buffer, tabla.buffer))
 # %%
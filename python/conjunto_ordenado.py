@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Conjunto de enteros sobre un array ordenado de NumPy con la interfaz de set
+@author: Alex Ballera
+"""
+#%%
+import operator
+
+import numpy as np
+
+#%% ===========================================================================
+# Operaciones sobre arrays ordenados y sin repetidos
+# =============================================================================
+def _pertenecen(buscados, ordenados):
+    """Máscara: qué elementos de `buscados` están en `ordenados` (búsqueda binaria)."""
+    if ordenados.size == 0 or buscados.size == 0:
+        return np.zeros(buscados.size, dtype=bool)
+    pos = np.searchsorted(ordenados, buscados)
+    pos[pos == ordenados.size] = 0
+    return ordenados[pos] == buscados
+
+
+def _fusionar(*arrays):
+    """Une arrays ordenados y quita repetidos.
+
+    El sort estable de NumPy (timsort) detecta los tramos ya ordenados y
+    los fusiona en tiempo lineal, sin reordenar desde cero.
+    """
+    todos = np.concatenate(arrays)
+    todos.sort(kind='stable')
+    if todos.size:
+        distintos = np.empty(todos.size, dtype=bool)
+        distintos[0] = True
+        np.not_equal(todos[1:], todos[:-1], out=distintos[1:])
+        todos = todos[distintos]
+    return todos
+
+#%% ===========================================================================
+# Conjunto ordenado
+# =============================================================================
+class ConjuntoOrdenado:
+    """Conjunto de enteros guardado como array ordenado: 8 bytes por elemento (int64).
+
+    Un `set` de Python usa ~60 bytes por entero (objeto + tabla hash). Aquí
+    las operaciones entre conjuntos son fusiones y búsquedas binarias sobre
+    arrays de NumPy, con los mismos nombres de método que `set`. Las
+    variantes `_update` escriben en el buffer propio, que tiene capacidad
+    de sobra, en lugar de pedir memoria nueva cada vez.
+
+    >>> a = ConjuntoOrdenado([10, 20, 30, 40])
+    >>> a.intersection([30, 40, 50, 60])
+    ConjuntoOrdenado([30, 40])
+    """
+    def __init__(self, valores=(), dtype=np.int64):
+        # copia propia: el buffer se modifica en el lugar y no debe ser el array de quien llama
+        datos = self._como_array(valores, dtype, copiar=True)
+        self._datos = datos
+        self._n = datos.size
+
+    @staticmethod
+    def _como_array(valores, dtype=np.int64, copiar=False):
+        """Array ordenado y sin repetidos en `dtype`; solo acepta enteros (un float se truncaría)."""
+        if isinstance(valores, ConjuntoOrdenado):
+            return valores.datos.astype(dtype, copy=copiar)
+        if isinstance(valores, (set, frozenset)) or not hasattr(valores, '__len__'):
+            valores = list(valores)
+        arr = np.asarray(valores).ravel()
+        if arr.size == 0:
+            return np.empty(0, dtype=dtype)
+        if not np.issubdtype(arr.dtype, np.integer):
+            raise TypeError(f'ConjuntoOrdenado solo guarda enteros, no {arr.dtype}')
+        if not np.can_cast(arr.dtype, dtype):
+            limites = np.iinfo(dtype)
+            if arr.min() < limites.min or arr.max() > limites.max:
+                raise OverflowError(f'hay valores fuera del rango de {np.dtype(dtype)}')
+        datos = arr.astype(dtype, copy=copiar)
+        if (datos[1:] > datos[:-1]).all():   # ya ordenado y sin repetidos: no hace falta unique
+            return datos
+        return np.unique(datos)
+
+    @classmethod
+    def _desde_ordenado(cls, datos):
+        conjunto = cls.__new__(cls)
+        conjunto._datos = datos
+        conjunto._n = datos.size
+        return conjunto
+
+    @property
+    def datos(self):
+        """Vista de solo lectura de los elementos ordenados."""
+        vista = self._datos[:self._n]
+        vista.flags.writeable = False
+        return vista
+
+    def _otro(self, otro):
+        return self._como_array(otro, self._datos.dtype)
+
+    def _reemplazar(self, datos):
+        """Copia `datos` al buffer propio; solo lo agranda (al doble) si no entra."""
+        if datos.size > self._datos.size:
+            buffer = np.empty(max(datos.size, 2 * self._datos.size), dtype=self._datos.dtype)
+            self._datos = buffer
+        self._datos[:datos.size] = datos
+        self._n = datos.size
+
+    def _filtrar(self, mascara):
+        """Se queda con los elementos marcados, compactándolos dentro del mismo buffer."""
+        conservados = self.datos[mascara]
+        self._datos[:conservados.size] = conservados
+        self._n = conservados.size
+
+    # ------------------------------------------------------------ operaciones
+    def union(self, *otros):
+        return self._desde_ordenado(_fusionar(self.datos, *(self._otro(o) for o in otros)))
+
+    def intersection(self, *otros):
+        resultado = self.datos
+        for otro in otros:
+            otro = self._otro(otro)
+            chico, grande = (resultado, otro) if resultado.size <= otro.size else (otro, resultado)
+            resultado = chico[_pertenecen(chico, grande)]
+        return self._desde_ordenado(resultado.copy())
+
+    def difference(self, *otros):
+        resultado = self.datos
+        for otro in otros:
+            resultado = resultado[~_pertenecen(resultado, self._otro(otro))]
+        return self._desde_ordenado(resultado.copy())
+
+    def symmetric_difference(self, otro):
+        otro = self._otro(otro)
+        return self._desde_ordenado(_fusionar(self.datos[~_pertenecen(self.datos, otro)],
+                                              otro[~_pertenecen(otro, self.datos)]))
+
+    def update(self, *otros):
+        self._reemplazar(self.union(*otros).datos)
+
+    def intersection_update(self, *otros):
+        for otro in otros:
+            self._filtrar(_pertenecen(self.datos, self._otro(otro)))
+
+    def difference_update(self, *otros):
+        for otro in otros:
+            self._filtrar(~_pertenecen(self.datos, self._otro(otro)))
+
+    def symmetric_difference_update(self, otro):
+        self._reemplazar(self.symmetric_difference(otro).datos)
+
+    # ------------------------------------------------------------- relaciones
+    def issubset(self, otro):
+        otro = self._otro(otro)
+        return self._n <= otro.size and bool(_pertenecen(self.datos, otro).all())
+
+    def issuperset(self, otro):
+        otro = self._otro(otro)
+        return otro.size <= self._n and bool(_pertenecen(otro, self.datos).all())
+
+    def isdisjoint(self, otro):
+        otro = self._otro(otro)
+        chico, grande = (self.datos, otro) if self._n <= otro.size else (otro, self.datos)
+        return not _pertenecen(chico, grande).any()
+
+    # --------------------------------------------------------------- elementos
+    def add(self, valor):
+        valor = operator.index(valor)   # solo enteros, como en el constructor
+        i = int(np.searchsorted(self.datos, valor))
+        if i < self._n and self._datos[i] == valor:
+            return
+        if self._n == self._datos.size:
+            buffer = np.empty(max(16, 2 * self._datos.size), dtype=self._datos.dtype)
+            buffer[:self._n] = self._datos[:self._n]
+            self._datos = buffer
+        self._datos[i + 1:self._n + 1] = self._datos[i:self._n]   # corre el resto un lugar
+        self._datos[i] = valor
+        self._n += 1
+
+    def discard(self, valor):
+        i = int(np.searchsorted(self.datos, valor))
+        if i < self._n and self._datos[i] == valor:
+            self._datos[i:self._n - 1] = self._datos[i + 1:self._n]
+            self._n -= 1
+
+    def remove(self, valor):
+        if valor not in self:
+            raise KeyError(valor)
+        self.discard(valor)
+
+    def pop(self):
+        """Quita y devuelve el mayor elemento (O(1))."""
+        if not self._n:
+            raise KeyError('pop from an empty set')
+        self._n -= 1
+        return self._datos[self._n].item()
+
+    def clear(self):
+        self._n = 0
+
+    def copy(self):
+        return self._desde_ordenado(self.datos.copy())
+
+    def __contains__(self, valor):
+        i = np.searchsorted(self.datos, valor)
+        return bool(i < self._n and self._datos[i] == valor)
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        return iter(self.datos.tolist())
+
+    def __eq__(self, otro):
+        if isinstance(otro, (ConjuntoOrdenado, set, frozenset)):
+            try:
+                return np.array_equal(self.datos, self._otro(otro))
+            except (TypeError, OverflowError):   # tiene elementos que aquí no pueden estar
+                return False
+        return NotImplemented
+
+    __hash__ = None
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __xor__ = symmetric_difference
+    __le__ = issubset
+    __ge__ = issuperset
+
+    def __ior__(self, otro):
+        self.update(otro)
+        return self
+
+    def __iand__(self, otro):
+        self.intersection_update(otro)
+        return self
+
+    def __isub__(self, otro):
+        self.difference_update(otro)
+        return self
+
+    def __ixor__(self, otro):
+        self.symmetric_difference_update(otro)
+        return self
+
+    @property
+    def nbytes(self):
+        return self._datos.nbytes
+
+    def __repr__(self):
+        if self._n > 20:
+            return f'ConjuntoOrdenado({self._n:,} elementos: {self.datos[:3].tolist()} ... {self.datos[-3:].tolist()})'
+        return f'ConjuntoOrdenado({self.datos.tolist()})'
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: ConjuntoOrdenado contra set de Python (tiempo y memoria)
+@author: Alex Ballera
+
+Uso:
+    python conjunto_ordenado_benchmark.py               # 1 millón de IDs por conjunto
+    python conjunto_ordenado_benchmark.py --n 2e7
+"""
+#%%
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from conjunto_ordenado import ConjuntoOrdenado
+
+#%%
+def memoria(construir):
+    tracemalloc.start()
+    resultado = construir()
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, actual
+
+
+def tiempo(funcion):
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+OPERACIONES = {
+    'union': lambda a, b: a.union(b),
+    'intersection': lambda a, b: a.intersection(b),
+    'difference': lambda a, b: a.difference(b),
+    'symmetric_difference': lambda a, b: a.symmetric_difference(b),
+    'issubset': lambda a, b: a.issubset(b),
+    'isdisjoint': lambda a, b: a.isdisjoint(b),
+    'intersection_update': lambda a, b: a.copy().intersection_update(b),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n', type=lambda x: int(float(x)), default=1_000_000)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(42)
+    ids_a = rng.choice(4 * args.n, args.n, replace=False)
+    ids_b = rng.choice(4 * args.n, args.n, replace=False)
+
+    # Se mide el set con sus objetos int (ids_a.tolist() crea los enteros adentro)
+    set_a, bytes_set = memoria(lambda: set(ids_a.tolist()))
+    set_b = set(ids_b.tolist())
+    orden_a, bytes_orden = memoria(lambda: ConjuntoOrdenado(ids_a))
+    orden_b = ConjuntoOrdenado(ids_b)
+
+    print(f'{args.n:,} enteros por conjunto')
+    print(f'{"memoria":>22}: set {bytes_set / args.n:6.1f} B/elem   '
+          f'ConjuntoOrdenado {bytes_orden / args.n:6.1f} B/elem\n')
+    for nombre, operacion in OPERACIONES.items():
+        t_set = tiempo(lambda: operacion(set_a, set_b))
+        t_orden = tiempo(lambda: operacion(orden_a, orden_b))
+        print(f'{nombre:>22}: set {t_set:.4f}s   ConjuntoOrdenado {t_orden:.4f}s   x{t_set / t_orden:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Construcción de textos sin concatenar con += y mayúsculas vectorizadas
+@author: Alex Ballera
+"""
+#%%
+import numpy as np
+
+#%% ===========================================================================
+# Constructor de textos
+# =============================================================================
+class ConstructorTexto:
+    """Acumula fragmentos de texto en una lista y los une con `''.join` al final.
+
+    `texto += letra` sobre un `str` copia todo el texto en cada paso cuando
+    hay otra referencia al mismo objeto (costo cuadrático); CPython solo lo
+    evita en el caso particular de una única referencia. Aquí cada fragmento
+    se copia una sola vez, siempre. Se usa igual que en list.py:
+
+    >>> palabra = ConstructorTexto()
+    >>> for l in arr:
+    ...     palabra += l
+    >>> str(palabra)
+    'abracadabra'
+    """
+    def __init__(self, texto=''):
+        self._partes = [texto] if texto else []
+        self._largo = len(texto)
+
+    def agregar(self, texto):
+        self._partes.append(texto)
+        self._largo += len(texto)
+        return self
+
+    __iadd__ = agregar
+
+    def extend(self, fragmentos):
+        for fragmento in fragmentos:
+            self.agregar(fragmento)
+        return self
+
+    def __len__(self):
+        return self._largo
+
+    def __str__(self):
+        if len(self._partes) > 1:
+            # Se guarda el resultado para no volver a unir en la próxima llamada
+            self._partes = [''.join(self._partes)]
+        return self._partes[0] if self._partes else ''
+
+    def __eq__(self, otro):
+        return str(self) == str(otro)
+
+    def __repr__(self):
+        return f'ConstructorTexto({str(self)!r})'
+
+#%% ===========================================================================
+# Mayúsculas
+# =============================================================================
+def mayusculas(texto):
+    """Equivale a `''.join(map(str.upper, texto))` sin recorrer carácter por carácter.
+
+    `str.upper` sobre el texto completo ya es un bucle en C con las reglas
+    Unicode (tildes, ñ, ß → SS); en el benchmark resulta más rápido que
+    pasar a bytes y restar 32 con NumPy.
+    """
+    return texto.upper()
+
+
+def mayusculas_array(textos):
+    """Mayúsculas de muchos textos a la vez con `np.char.upper` (un valor por fila).
+
+    Ojo: el dtype de ancho fijo trunca las expansiones ('ß' → 'SS' queda 'S'
+    si no entra); para esos casos usar `mayusculas` sobre cada texto.
+    """
+    return np.char.upper(np.asarray(textos, dtype=str))
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de construcción de textos y mayúsculas a 1 KB, 1 MB y 100 MB
+@author: Alex Ballera
+
+Uso:
+    python constructor_texto_benchmark.py
+    python constructor_texto_benchmark.py --tamanos 1e3 1e6 --max-lento 1e8
+
+Los caminos que iteran carácter por carácter en Python se omiten por
+encima de --max-lento (1 MB por defecto) y el += cuadrático por encima de
+--max-cuadratico (100 KB) para que la corrida termine.
+"""
+#%%
+import argparse
+import time
+
+import numpy as np
+
+from constructor_texto import ConstructorTexto, mayusculas
+
+#%%
+def concatenar_mas_igual(letras):
+    palabra = ''
+    for l in letras:
+        palabra += l
+    return palabra
+
+
+def concatenar_mas_igual_con_referencia(letras):
+    """Como el anterior, pero otra variable apunta al texto: CPython ya no puede
+    ampliar el str en el lugar y cada += copia todo (costo cuadrático)."""
+    palabra = ''
+    for l in letras:
+        palabra += l
+        anterior = palabra  # noqa: F841
+    return palabra
+
+
+def concatenar_constructor(letras):
+    palabra = ConstructorTexto()
+    for l in letras:
+        palabra += l
+    return str(palabra)
+
+
+def concatenar_join(letras):
+    return ''.join(letras)
+
+
+def mayusculas_map(palabra):
+    pal = ''
+    for letra in (list(map(str.upper, palabra))):
+        pal += letra
+    return pal
+
+
+def mayusculas_map_join(palabra):
+    return ''.join(map(str.upper, palabra))
+
+
+def mayusculas_numpy_bytes(palabra):
+    """Solo ASCII: resta 32 a las minúsculas sobre el buffer de bytes."""
+    codigos = np.frombuffer(palabra.encode('ascii'), dtype=np.uint8).copy()
+    codigos[(codigos >= ord('a')) & (codigos <= ord('z'))] -= 32
+    return codigos.tobytes().decode('ascii')
+
+
+CONCATENAR = {'+= en bucle': concatenar_mas_igual, '+= con referencia': concatenar_mas_igual_con_referencia,
+              'ConstructorTexto': concatenar_constructor, "''.join": concatenar_join}
+MAYUSCULAS = {'map + +=': mayusculas_map, 'map + join': mayusculas_map_join,
+              'NumPy bytes': mayusculas_numpy_bytes, 'mayusculas': mayusculas}
+LENTOS = {'+= en bucle', 'ConstructorTexto', 'map + +=', 'map + join'}
+CUADRATICOS = {'+= con referencia'}
+
+
+def medir(funcion, argumento):
+    inicio = time.perf_counter()
+    funcion(argumento)
+    return time.perf_counter() - inicio
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanos', type=lambda x: int(float(x)), nargs='+', default=[10**3, 10**6, 10**8])
+    parser.add_argument('--max-lento', type=lambda x: int(float(x)), default=10**6)
+    parser.add_argument('--max-cuadratico', type=lambda x: int(float(x)), default=10**5)
+    args = parser.parse_args(argv)
+
+    for tamano in args.tamanos:
+        palabra = ('abracadabra' * (tamano // 11 + 1))[:tamano]
+        letras = list(palabra)
+        print(f'\n{tamano:,} caracteres')
+        for grupo, argumento in ((CONCATENAR, letras), (MAYUSCULAS, palabra)):
+            for nombre, funcion in grupo.items():
+                if nombre in LENTOS and tamano > args.max_lento:
+                    print(f'{nombre:>20}: omitido (> --max-lento)')
+                    continue
+                if nombre in CUADRATICOS and tamano > args.max_cuadratico:
+                    print(f'{nombre:>20}: omitido (> --max-cuadratico)')
+                    continue
+                print(f'{nombre:>20}: {medir(funcion, argumento):.6f}s')
+        del letras
+
+
+if __name__ == '__main__':
+    main()
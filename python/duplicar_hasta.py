@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Versión vectorizada de `while p < limite: p *= 2` para arrays de NumPy
+@author: Alex Ballera
+"""
+#%%
+import numpy as np
+
+#%%
+def duplicar_hasta(precios, limite=1000):
+    """Duplica cada precio hasta que alcance `limite`, sin bucle por elemento.
+
+    Equivale a, para cada p:
+
+        while p < limite:
+            p *= 2
+
+    es decir p * 2**k con el menor k >= 0 tal que p * 2**k >= limite. k se
+    obtiene de forma exacta comparando mantisas y exponentes (`np.frexp`)
+    en lugar de `ceil(log2(limite / p))`, que puede fallar por redondeo
+    justo en los bordes (p * 2**k == limite). Como multiplicar por 2**k es
+    exacto en punto flotante, el resultado es idéntico al del bucle. Los
+    enteros se duplican con desplazamiento de bits y conservan su dtype.
+
+    Un precio <= 0 menor que `limite` haría que el bucle no terminara
+    nunca: en ese caso se lanza ValueError. Los NaN se devuelven sin cambios
+    (`nan < limite` es falso, el bucle no corre). Con enteros angostos
+    (int8, uint16, ...) el resultado puede no entrar en el dtype: en vez de
+    desbordar en silencio también se lanza ValueError.
+    """
+    precios = np.asarray(precios)
+    if precios.dtype.kind not in 'iuf':
+        raise TypeError(f'se esperaban números, no {precios.dtype}')
+
+    duplicar = precios < limite
+    infinitos = duplicar & (precios <= 0)
+    if infinitos.any():
+        raise ValueError(f'{int(infinitos.sum())} precio(s) <= 0 nunca alcanzan {limite}: '
+                         f'{precios[infinitos][:5].tolist()}')
+
+    mantisa_p, exponente_p = np.frexp(precios[duplicar].astype(np.float64))
+    mantisa_l, exponente_l = np.frexp(np.float64(limite))
+    # p * 2**k >= limite  <=>  k >= e_l - e_p  (+1 si la mantisa de p es menor)
+    k = exponente_l - exponente_p + (mantisa_p < mantisa_l)
+
+    resultado = precios.copy()
+    if precios.dtype.kind == 'f':
+        resultado[duplicar] = np.ldexp(precios[duplicar], k)
+        return resultado
+
+    # p << k entra en el dtype  <=>  k < bits y p <= maximo >> k
+    info = np.iinfo(precios.dtype)
+    desplazamiento = np.minimum(k, info.bits - 1).astype(precios.dtype)
+    desborda = (k >= info.bits) | (precios[duplicar] > np.right_shift(precios.dtype.type(info.max), desplazamiento))
+    if desborda.any():
+        raise ValueError(f'{int(desborda.sum())} precio(s) no entran en {precios.dtype} al duplicarlos '
+                         f'hasta {limite}: {precios[duplicar][desborda][:5].tolist()}; '
+                         f'convertir antes a un entero más ancho')
+    resultado[duplicar] = np.left_shift(precios[duplicar], k.astype(precios.dtype))
+    return resultado
@@ -133,6 +133,16 @@ copy3 = copy.deepcopy(original)
 print(f'Misma lista? {copy3 is original}')
 print(f'Misma referencia? {copy3[0] is original[0]}')
 
+#%% Copy-on-write: misma semántica que deepcopy, pero copiar es O(1)
+from lista_persistente import ListaCOW
+
+original_cow = ListaCOW(original)
+copy4 = copy.deepcopy(original_cow) # solo crea una raíz nueva, comparte las filas
+print(f'Misma lista? {copy4 is original_cow}')
+print(f'Misma referencia? {copy4[0] is original_cow[0]}')
+copy4[0].append('z')                # copia solo el camino modificado
+print(original_cow, copy4)
+
 #%% ===============================================================================
 letras = ['a', 'b', 'c']
 numeros = [1, 2, 3]
@@ -168,6 +178,15 @@ for letra in (list(map(str.upper, palabra))):
 
 pal  # pyright: ignore[reportUnusedExpression]
 
+#%% Lo mismo sin += (lineal siempre) y mayúsculas sobre el texto completo
+from constructor_texto import ConstructorTexto, mayusculas
+
+palabra2 = ConstructorTexto()
+for l in arr:
+    palabra2 += l
+
+print(palabra2, mayusculas(str(palabra2)) == pal)
+
 #%% ===============================================================================
 # Filtros
 letras = ['a', '', 'b', None, 'c', '23']
@@ -198,6 +217,12 @@ print(precios_mod)
 precios_mod2 = [p * 2 for p in precios if p < 50]
 print(precios_mod2)
 
+# Pipeline perezoso: mismas etapas, sin listas intermedias
+from pipeline_perezoso import Pipeline
+
+precios_mod3 = Pipeline(precios).filter(lambda p: p < 50).map(lambda p: p * 2)
+print(precios_mod3.lista(), precios_mod3.lista() == precios_mod)
+
 precios_new = []
 for p in precios:
     while p < 1000:
@@ -206,6 +231,40 @@ for p in precios:
 
 print(precios_new)
 print(list(enumerate(precios_new)))
+
+#%% El mismo while vectorizado: p * 2**k con el menor k que alcanza 1000
+import numpy as np
+
+from duplicar_hasta import duplicar_hasta
+
+print(duplicar_hasta(precios).tolist() == precios_new)
+
+# Comprobación con valores aleatorios (enteros y flotantes) contra el bucle
+def duplicar_bucle(p, limite=1000):
+    while p < limite:
+        p *= 2
+    return p
+
+rng = np.random.default_rng(42)
+for muestra in (rng.integers(1, 5000, 10_000), rng.uniform(1e-6, 2000, 10_000)):
+    assert duplicar_hasta(muestra).tolist() == [duplicar_bucle(p) for p in muestra.tolist()]
+
+# Enteros angostos: o da lo mismo que el bucle (con int de Python) o avisa que no entra
+for dtype in (np.int8, np.uint8):
+    maximo = np.iinfo(dtype).max
+    for limite in rng.integers(1, 300, 50).tolist():
+        muestra = rng.integers(1, maximo, 20, endpoint=True).astype(dtype)
+        esperado = [duplicar_bucle(p, limite) for p in muestra.tolist()]
+        try:
+            assert duplicar_hasta(muestra, limite).tolist() == esperado
+        except ValueError:
+            assert max(esperado) > maximo
+
+# Con 0 o negativos el bucle no termina nunca; la versión vectorizada avisa
+try:
+    duplicar_hasta([12, 0, -5])
+except ValueError as error:
+    print(error)
 #%% ===============================================================================
 # Sets, Conjuntos
 a = {10, 20, 30, 40}
@@ -265,6 +324,20 @@ a2 = a.copy()
 symmetric_difference_update = a2.symmetric_difference_update(b)
 print(f'\nsymmetric_difference_update {symmetric_difference_update} - {a2}') 
 
+#%% Mismas operaciones sobre arrays ordenados de NumPy (8 bytes por entero)
+from conjunto_ordenado import ConjuntoOrdenado
+
+a_ord = ConjuntoOrdenado(a)
+b_ord = ConjuntoOrdenado(b)
+print(f'union {a_ord.union(b_ord)}')
+print(f'diferencia {a_ord.difference(b_ord)}')
+print(f'intersection {a_ord.intersection(b_ord)}')
+print(f'symmetric_difference {a_ord.symmetric_difference(b_ord)}')
+
+a2_ord = a_ord.copy()
+a2_ord.intersection_update(b_ord) # compacta dentro del mismo buffer
+print(f'intersection_update {a2_ord} {a2_ord == a.intersection(b)}')
+
 #%% ===============================================================================
 a = {10, 20, 30, 40}
 b = {30, 40, 50, 60}
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Listas anidadas con copia perezosa (copy-on-write) y estructura compartida
+@author: Alex Ballera
+"""
+#%%
+from itertools import count
+
+#%% ===========================================================================
+# Nodos inmutables
+# =============================================================================
+_claves = count()
+
+
+class _Nodo(tuple):
+    """Tupla que representa una lista anidada (para distinguirla de tuplas que son valores).
+
+    `clave` identifica a la sublista a lo largo de sus versiones: cuando un
+    cambio recrea el nodo, el nuevo conserva la clave del anterior.
+    """
+    def __new__(cls, hijos=(), clave=None):
+        nodo = super().__new__(cls, hijos)
+        nodo.clave = next(_claves) if clave is None else clave
+        return nodo
+
+    # Una sublista nunca es igual a una tupla, como [1, 2] != (1, 2)
+    def __eq__(self, otro):
+        return isinstance(otro, _Nodo) and tuple.__eq__(self, otro)
+
+    def __ne__(self, otro):
+        return not self == otro
+
+    __hash__ = tuple.__hash__
+
+
+def _congelar(valor, estricto=True):
+    """Pasa listas a `_Nodo`; el resto de los valores se comparte tal cual entre copias.
+
+    Por eso solo se admiten valores inmutables (hashables, como las claves
+    de un dict): un dict o un set compartido se vería modificado desde
+    todas las copias. Con `estricto=False` (búsquedas y comparaciones) se
+    devuelven sin validar.
+    """
+    if isinstance(valor, ListaCOW):
+        return _Nodo(valor._nodo())   # mismo contenido, otra sublista
+    if isinstance(valor, list):
+        return _Nodo(_congelar(v, estricto) for v in valor)
+    if estricto:
+        try:
+            hash(valor)
+        except TypeError:
+            raise TypeError(f'ListaCOW solo guarda listas y valores inmutables, no {type(valor).__name__}: '
+                            f'se compartiría entre las copias') from None
+    return valor
+
+
+def _descongelar(valor):
+    if isinstance(valor, _Nodo):
+        return [_descongelar(v) for v in valor]
+    return valor
+
+
+def _reemplazar_en(nodo, ruta, nuevo):
+    """Devuelve una copia de `nodo` con `nuevo` en `ruta` (path copying).
+
+    Solo se recrean las tuplas del camino de la raíz hasta `ruta`; todas las
+    demás ramas se comparten con la versión anterior.
+    """
+    if not ruta:
+        return nuevo
+    i, *resto = ruta
+    hijos = list(nodo)
+    hijos[i] = _reemplazar_en(nodo[i], resto, nuevo)
+    return _Nodo(hijos, nodo.clave)
+
+
+def _buscar(nodo, clave):
+    """Ruta de la sublista con `clave` dentro de `nodo`, o None si ya no está."""
+    pendientes = [((), nodo)]
+    while pendientes:
+        ruta, nodo = pendientes.pop()
+        if nodo.clave == clave:
+            return ruta
+        pendientes.extend(((*ruta, i), hijo) for i, hijo in reversed(list(enumerate(nodo)))
+                          if isinstance(hijo, _Nodo))
+    return None
+
+
+class _Raiz:
+    __slots__ = ('nodo',)
+
+    def __init__(self, nodo):
+        self.nodo = nodo
+
+#%% ===========================================================================
+# Lista con copia perezosa
+# =============================================================================
+class ListaCOW:
+    """Lista anidada con la interfaz de `list` donde copiar cuesta O(1).
+
+    Los datos viven en tuplas inmutables compartidas. `copy()`,
+    `copy.copy()` y `copy.deepcopy()` solo crean una nueva raíz que apunta
+    a las mismas tuplas; una modificación recrea las tuplas del camino
+    afectado y deja intactas las demás, así que las copias nunca se ven
+    entre sí (igual que con `copy.deepcopy` sobre listas).
+
+    El precio está en las escrituras: cada `append`, `insert`, `pop` o
+    asignación recrea la tupla de la sublista modificada (y las de sus
+    ancestros), O(largo de esa sublista) en lugar del O(1) de `list`.
+    Armar una lista de n filas con n `append` cuesta O(n²) (20.000 filas
+    ≈ 2 s): conviene construirla de una vez, `ListaCOW(filas)`, o con
+    `extend`, que copia una sola vez.
+
+    Además de listas solo guarda valores inmutables (números, textos,
+    tuplas...): un dict o un set no se puede compartir entre copias y da
+    TypeError. Una sublista nunca es igual a una tupla, como en `list`.
+
+    `lista[i]` sobre una sublista devuelve una vista de esa sublista:
+    `matrix[1].append('z')` modifica `matrix` como con listas comunes. La
+    vista sigue a la sublista aunque se inserten o borren filas antes de
+    ella; si se borra la sublista, la vista queda suelta con su último
+    contenido, como una lista que se saca de otra.
+
+    >>> original = ListaCOW([['a', 'b'], ['c', 'd']])
+    >>> copia = copy.deepcopy(original)
+    >>> copia[0].append('x')
+    >>> original
+    [['a', 'b'], ['c', 'd']]
+    """
+    __slots__ = ('_raiz', '_ruta', '_ultimo')
+
+    def __init__(self, valores=()):
+        nodo = _Nodo(_congelar(v) for v in valores)
+        self._raiz = _Raiz(nodo)
+        self._ruta = ()
+        self._ultimo = nodo
+
+    @classmethod
+    def _vista(cls, raiz, ruta, nodo):
+        vista = cls.__new__(cls)
+        vista._raiz = raiz
+        vista._ruta = ruta
+        vista._ultimo = nodo
+        return vista
+
+    def _nodo(self):
+        """Versión actual de la sublista: en la última ruta conocida o, si se movió, buscada por clave."""
+        clave = self._ultimo.clave
+        nodo = self._raiz.nodo
+        try:
+            for i in self._ruta:
+                nodo = nodo[i]
+        except (IndexError, TypeError):
+            nodo = None
+        if not isinstance(nodo, _Nodo) or nodo.clave != clave:
+            ruta = _buscar(self._raiz.nodo, clave)
+            if ruta is None:   # la borraron: sigue sola con el último contenido
+                self._raiz, ruta = _Raiz(self._ultimo), ()
+            self._ruta = ruta
+            nodo = self._raiz.nodo
+            for i in ruta:
+                nodo = nodo[i]
+        self._ultimo = nodo
+        return nodo
+
+    def _guardar(self, hijos):
+        clave = self._nodo().clave
+        self._raiz.nodo = _reemplazar_en(self._raiz.nodo, self._ruta, _Nodo(hijos, clave))
+        self._nodo()
+
+    def _envolver(self, i, valor):
+        return ListaCOW._vista(self._raiz, (*self._ruta, i), valor) if isinstance(valor, _Nodo) else valor
+
+    # ------------------------------------------------------------ copias O(1)
+    def copy(self):
+        nodo = self._nodo()
+        return ListaCOW._vista(_Raiz(nodo), (), nodo)
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        # Las tuplas son inmutables: compartirlas equivale a copiarlas en profundidad
+        return self.copy()
+
+    def tolist(self):
+        return _descongelar(self._nodo())
+
+    # ---------------------------------------------------------------- lectura
+    def __len__(self):
+        return len(self._nodo())
+
+    def __getitem__(self, indice):
+        nodo = self._nodo()
+        if isinstance(indice, slice):
+            return ListaCOW(nodo[indice])
+        i = range(len(nodo))[indice]   # normaliza negativos y valida el rango
+        return self._envolver(i, nodo[i])
+
+    def __iter__(self):
+        for i, valor in enumerate(self._nodo()):
+            yield self._envolver(i, valor)
+
+    def __contains__(self, valor):
+        return _congelar(valor, estricto=False) in self._nodo()
+
+    def index(self, valor, *args):
+        return self._nodo().index(_congelar(valor, estricto=False), *args)
+
+    def count(self, valor):
+        return self._nodo().count(_congelar(valor, estricto=False))
+
+    def __eq__(self, otra):
+        if isinstance(otra, (ListaCOW, list)):
+            return self._nodo() == _congelar(otra, estricto=False)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    # ------------------------------------------------------------ escritura
+    def __setitem__(self, indice, valor):
+        hijos = list(self._nodo())
+        if isinstance(indice, slice):
+            hijos[indice] = [_congelar(v) for v in valor]
+        else:
+            hijos[indice] = _congelar(valor)
+        self._guardar(hijos)
+
+    def __delitem__(self, indice):
+        hijos = list(self._nodo())
+        del hijos[indice]
+        self._guardar(hijos)
+
+    def append(self, valor):
+        self._guardar((*self._nodo(), _congelar(valor)))
+
+    def extend(self, valores):
+        self._guardar((*self._nodo(), *(_congelar(v) for v in valores)))
+
+    def __iadd__(self, valores):
+        self.extend(valores)
+        return self
+
+    def insert(self, indice, valor):
+        hijos = list(self._nodo())
+        hijos.insert(indice, _congelar(valor))
+        self._guardar(hijos)
+
+    def pop(self, indice=-1):
+        hijos = list(self._nodo())
+        valor = hijos.pop(indice)
+        self._guardar(hijos)
+        return _descongelar(valor)
+
+    def remove(self, valor):
+        hijos = list(self._nodo())
+        hijos.remove(_congelar(valor, estricto=False))
+        self._guardar(hijos)
+
+    def clear(self):
+        self._guardar(())
+
+    def reverse(self):
+        self._guardar(self._nodo()[::-1])
+
+    def sort(self, *, key=None, reverse=False):
+        nodo = self._nodo()
+        if key is None:
+            self._guardar(sorted(nodo, reverse=reverse))
+        else:
+            claves = [key(self._envolver(i, v)) for i, v in enumerate(nodo)]
+            orden = sorted(range(len(nodo)), key=claves.__getitem__, reverse=reverse)
+            self._guardar([nodo[i] for i in orden])
+
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipeline perezoso: filter/map/take encadenados sin listas intermedias
+@author: Alex Ballera
+"""
+#%%
+from itertools import islice
+
+import numpy as np
+
+#%% ===========================================================================
+# Etapas: cada una recibe un iterador y devuelve otro
+# =============================================================================
+def _lotes(iterador, tamano, dtype):
+    """Arrays de hasta `tamano` valores; con `dtype=None` cada lote toma el tipo de sus valores."""
+    while True:
+        if dtype is None:
+            lote = list(islice(iterador, tamano))
+            if not lote:
+                return
+            yield np.asarray(lote)
+        else:
+            lote = np.fromiter(islice(iterador, tamano), dtype=dtype)
+            if lote.size == 0:
+                return
+            yield lote
+
+
+def _map_numpy(iterador, funcion, tamano, dtype):
+    for lote in _lotes(iterador, tamano, dtype):
+        yield from np.asarray(funcion(lote)).tolist()
+
+
+def _filter_numpy(iterador, condicion, tamano, dtype):
+    for lote in _lotes(iterador, tamano, dtype):
+        yield from lote[condicion(lote)].tolist()
+
+#%% ===========================================================================
+# Pipeline
+# =============================================================================
+class Pipeline:
+    """Cadena de etapas que se evalúa elemento a elemento recién al consumirla.
+
+    Cada método devuelve un Pipeline nuevo (no modifica el actual) y no
+    recorre nada: las etapas se encadenan como generadores, así cada valor
+    atraviesa todas las etapas antes de leer el siguiente y nunca se arma
+    una lista intermedia. Funciona con fuentes infinitas mientras alguna
+    etapa (`take`) corte el flujo.
+
+    >>> Pipeline(precios).filter(lambda p: p < 50).map(lambda p: p * 2).lista()
+    [2, 86, 98]
+
+    Las etapas numéricas pueden ir por lotes a NumPy con `map_numpy` y
+    `filter_numpy`: los valores se juntan de a `tamano_lote`, se procesan
+    vectorizados y se vuelven a entregar de a uno. Sin `dtype` cada lote
+    conserva el tipo de sus valores (los enteros siguen siendo enteros);
+    con `dtype=np.float64` se evita armar la lista del lote.
+    """
+    def __init__(self, fuente, _etapas=()):
+        self._fuente = fuente
+        self._etapas = _etapas
+
+    def _agregar(self, etapa):
+        return Pipeline(self._fuente, (*self._etapas, etapa))
+
+    def __iter__(self):
+        iterador = iter(self._fuente)
+        for etapa in self._etapas:
+            iterador = etapa(iterador)
+        return iterador
+
+    # ------------------------------------------------------------- etapas
+    def filter(self, condicion):
+        """Como `filter`: con `None` se quedan los valores verdaderos."""
+        return self._agregar(lambda iterador: filter(condicion, iterador))
+
+    def map(self, funcion):
+        return self._agregar(lambda iterador: map(funcion, iterador))
+
+    def take(self, n):
+        return self._agregar(lambda iterador: islice(iterador, n))
+
+    def skip(self, n):
+        return self._agregar(lambda iterador: islice(iterador, n, None))
+
+    def zip(self, *otros):
+        return self._agregar(lambda iterador: zip(iterador, *otros))
+
+    def enumerate(self, inicio=0):
+        return self._agregar(lambda iterador: enumerate(iterador, inicio))
+
+    def lotes(self, tamano, dtype=None):
+        """Agrupa en arrays de NumPy de hasta `tamano` valores (el último puede ser menor)."""
+        return self._agregar(lambda iterador: _lotes(iterador, tamano, dtype))
+
+    def map_numpy(self, funcion, tamano_lote=4096, dtype=None):
+        """`funcion` recibe un array con un lote y devuelve un array del mismo largo."""
+        return self._agregar(lambda iterador: _map_numpy(iterador, funcion, tamano_lote, dtype))
+
+    def filter_numpy(self, condicion, tamano_lote=4096, dtype=None):
+        """`condicion` recibe un array con un lote y devuelve una máscara booleana."""
+        return self._agregar(lambda iterador: _filter_numpy(iterador, condicion, tamano_lote, dtype))
+
+    # ----------------------------------------------------------- consumo
+    def lista(self):
+        return list(self)
+
+    def array(self, dtype=None):
+        if dtype is None:
+            return np.asarray(list(self))
+        return np.fromiter(self, dtype=dtype)
+
+    def suma(self, inicio=0):
+        return sum(self, inicio)
+
+    def primero(self, defecto=None):
+        return next(iter(self), defecto)
+
+    def __repr__(self):
+        return f'Pipeline({self._fuente!r}, {len(self._etapas)} etapas)'